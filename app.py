@@ -1,25 +1,68 @@
 # app.py - Flask application
 import os
 import pandas as pd
+import numpy as np
 import json
+import logging
 import uuid
 import re
+import hashlib
+import importlib.util
 import xlsxwriter
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, send_file, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.utils import secure_filename
 from io import BytesIO
 import shutil
-from openpyxl import load_workbook
+import zipfile
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
+from openpyxl.packaging.relationship import get_dependents, get_rels_path
+from openpyxl.packaging.workbook import WorkbookPackage
+from openpyxl.xml.functions import fromstring
 from copy import copy
+from functools import lru_cache
+try:
+    import orjson
+except ImportError:  # optional, responses fall back to Flask's json encoder
+    orjson = None
+try:
+    import fcntl
+except ImportError:  # not available on Windows, files are always copied there
+    fcntl = None
 from tests.validation.test_validator import QAATestValidator, format_test_results_for_display, format_multi_year_test_results_for_display
 
+# Copy-on-write: filtered frames share memory with the session data until they are modified,
+# so the reports don't need to take full copies before adding their own columns
+pd.set_option("mode.copy_on_write", True)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Encodes JSON responses with orjson, which is much faster than the standard library
+    for the large count dictionaries returned by the preview endpoints
+    """
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+logger = logging.getLogger(__name__)
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16 MB max upload
 app.config['GENERATED_FILES'] = 'generated_files'
+# Behind a server with X-Sendfile support (e.g. Apache mod_xsendfile), let it send downloads itself
+app.config['USE_X_SENDFILE'] = os.environ.get('WEBALUMNI_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
 
 # Create upload and output directories if they don't exist
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
@@ -29,6 +72,23 @@ os.makedirs(app.config['GENERATED_FILES'], exist_ok=True)
 # In production, you would use a proper database or session management
 session_data = {}
 
+# Parsed Excel files keyed by content hash, so the same file is only parsed once
+excel_cache = {}
+excel_cache_size = 8
+
+# Write buffer for generated Excel files, so the zip writer makes fewer, larger writes
+output_buffer_size = 1 << 20
+
+# FICLONE ioctl (Linux), clones a file without copying its data on btrfs/XFS
+ficlone_request = getattr(fcntl, "FICLONE", 0x40049409)
+
+# Use the calamine reader for uploads when python-calamine is installed,
+# it parses xlsx files much faster than openpyxl (None = pandas default)
+excel_read_engine = "calamine" if importlib.util.find_spec("python_calamine") else None
+
+# Relationship type linking a worksheet part to its table parts
+table_rel_type = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/table"
+
 # -----------------------------
 # Define Constants
 # -----------------------------
@@ -40,6 +100,15 @@ college_options = [
     "College of Pharmacy"
 ]
 
+# Short college names used in report sheet names
+college_abbreviations = {
+    "College of Engineering & Advan": "CoE",
+    "College of Business": "CoB",
+    "College of Science & General S": "CoS",
+    "College of Medicine": "CoM",
+    "College of Pharmacy": "CoP"
+}
+
 # Expected Current Status values
 expected_current_status = [
     "Employed",
@@ -80,6 +149,228 @@ default_graduation_years = [
     "2024-2025 FALL"
 ]
 
+# Statuses counted as "Employed" in the employment breakdowns
+employed_statuses = [
+    "Employed", "Employed - add to list", "Business owner",
+    "Training", "Do not contact", "Others",
+    "Left the country", "Passed away", "New graduate"
+]
+
+# Workplace values that mean "no company", grouped by category
+company_empty_patterns = {
+    'COMPLETELY EMPTY': [
+        '', '-', '.', ' ', '...', '*', '#', '//',
+    ],
+    'PLACEHOLDER': [
+        '#N/A', 'N/A', 'NA', 'N.A.', 'N/A.', 'NONE', 'NIL',
+        'NOT APPLICABLE', 'NOT AVAILABLE', 'UNKNOWN',
+    ],
+    'CONFIDENTIAL': [
+        'CONFIDENTIAL', 'CONFIDENTIAL GOVERNMENT', 'GOVERNMENT',
+        'GOVERNMENT SECTOR', 'CONFIDENTIAL (STEALTH MODE)',
+        'CONFIDENTIAL ( STEALTH MODE )', 'CONFIDENTIAL COMPANY',
+        'CANNOT DISCLOSE', 'UNDISCLOSED',
+    ],
+    'OTHERS': [
+        'OTHERS', 'OTHER', 'MISC', 'MISCELLANEOUS', 'TBD',
+        'TO BE DETERMINED', 'PENDING',
+    ],
+    'NOT WORKING': [
+        'NOT WORKING', 'UNEMPLOYED', 'NO JOB', 'NO WORK',
+        'LOOKING FOR JOB', 'SEEKING EMPLOYMENT',
+    ]
+}
+
+# Flattened pattern -> category lookup for vectorized normalization
+company_empty_lookup = {
+    pattern: category
+    for category, patterns in company_empty_patterns.items()
+    for pattern in patterns
+}
+
+# Company aliases used by normalize_company_name()
+company_aliases = {
+    # Banks
+    'SNB': 'SAUDI NATIONAL BANK',
+    'SAUDI NATIONAL BANK': 'SAUDI NATIONAL BANK',
+    'SNB CAPITAL': 'SAUDI NATIONAL BANK',
+    'THE SAUDI NATIONAL BANK': 'SAUDI NATIONAL BANK',
+    'NCB': 'SAUDI NATIONAL BANK',
+    'BSF': 'BANQUE SAUDI FRANSI',
+    'BANQUE SAUDI FRANSI': 'BANQUE SAUDI FRANSI',
+    'BANQUE SAUDI FRANSI CAPITAL': 'BANQUE SAUDI FRANSI',
+    'FRANSI CAPITAL': 'BANQUE SAUDI FRANSI',
+    'SAB': 'SAUDI BRITISH BANK',
+    'SABB': 'SAUDI BRITISH BANK',
+    'BANK SAB': 'SAUDI BRITISH BANK',
+
+    # Government/PIF entities
+    'PIF': 'PUBLIC INVESTMENT FUND',
+    'PUBLIC INVESTMENT FUND - PIF': 'PUBLIC INVESTMENT FUND',
+    'SAMA': 'SAUDI CENTRAL BANK',
+    'SAUDI CENTRAL BANK - SAMA': 'SAUDI CENTRAL BANK',
+    'SIDF': 'SAUDI INDUSTRIAL DEVELOPMENT FUND',
+    'SAUDI INDUSTRIAL DEVELOPMENT FUND - SIDF': 'SAUDI INDUSTRIAL DEVELOPMENT FUND',
+
+    # Consulting firms
+    'BCG': 'BOSTON CONSULTING GROUP',
+    'BOSTON CONSULTING GROUP (BCG)': 'BOSTON CONSULTING GROUP',
+    'EY': 'ERNST & YOUNG',
+    'ERNST & YOUNG (EY)': 'ERNST & YOUNG',
+    'PWC': 'PRICEWATERHOUSECOOPERS',
+
+    # Healthcare
+    'KFSH&RC': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
+    'KFSHRC': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
+    'KFSH': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
+    'KING FAISAL SPECIALIST HOSPITAL': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
+    'HABIB': 'DR. SULAIMAN AL HABIB MEDICAL GROUP',
+    'DR. SULAIMAN AL HABIB': 'DR. SULAIMAN AL HABIB MEDICAL GROUP',
+
+    # Tech companies
+    'STC': 'SAUDI TELECOM COMPANY',
+    'SAUDI TELECOM': 'SAUDI TELECOM COMPANY',
+    'HPE': 'HEWLETT PACKARD ENTERPRISE',
+    'HEWLETT PACKARD ENTERPRISE - HPE': 'HEWLETT PACKARD ENTERPRISE',
+
+    # Common typos/variations
+    'ARAMCO': 'SAUDI ARAMCO',
+    'SAUDI ARAMCO': 'SAUDI ARAMCO',
+    'SABIC': 'SAUDI BASIC INDUSTRIES CORPORATION',
+    'MINISTRY OF HEALTH': 'MINISTRY OF HEALTH',
+    'MINISTRY OF HEALTH ': 'MINISTRY OF HEALTH',
+}
+
+# The alias names as a categorical dtype plus the matching targets, so a whole
+# column can be resolved through category codes in normalize_company_names()
+company_alias_dtype = pd.CategoricalDtype(categories=list(company_aliases))
+company_alias_targets = np.array(list(company_aliases.values()), dtype=object)
+
+# Corporate suffixes stripped from company names
+company_remove_words = [
+    'LTD', 'LIMITED', 'CORPORATION', 'CORP', 'INC', 'LLC', 'CO',
+    'COMPANY', 'GROUP', 'HOLDING', 'HOLDINGS', 'INTERNATIONAL',
+    'SAUDI ARABIA', 'KSA', 'MIDDLE EAST'
+]
+
+# Matches any of the suffixes above as a whole word, longest first so that
+# 'HOLDINGS' wins over 'HOLDING' and 'COMPANY' over 'CO'
+company_remove_re = re.compile(
+    r' (?:' + '|'.join(re.escape(word) for word in sorted(company_remove_words, key=len, reverse=True)) + r')\b'
+)
+
+# High position keywords with normalization mapping, checked in this order
+high_position_mapping = {
+    # C-Suite positions
+    'CEO': 'CHIEF EXECUTIVE OFFICER',
+    'CHIEF EXECUTIVE OFFICER': 'CHIEF EXECUTIVE OFFICER',
+    'PRESIDENT': 'PRESIDENT',
+    'CFO': 'CHIEF FINANCIAL OFFICER',
+    'CHIEF FINANCIAL OFFICER': 'CHIEF FINANCIAL OFFICER',
+    'CTO': 'CHIEF TECHNOLOGY OFFICER',
+    'CHIEF TECHNOLOGY OFFICER': 'CHIEF TECHNOLOGY OFFICER',
+    'CIO': 'CHIEF INFORMATION OFFICER',
+    'CHIEF INFORMATION OFFICER': 'CHIEF INFORMATION OFFICER',
+    'COO': 'CHIEF OPERATING OFFICER',
+    'CHIEF OPERATING OFFICER': 'CHIEF OPERATING OFFICER',
+    'CMO': 'CHIEF MARKETING OFFICER',
+    'CHIEF MARKETING OFFICER': 'CHIEF MARKETING OFFICER',
+    'CHIEF': 'CHIEF',  # Generic chief
+    
+    # Director level
+    'DIRECTOR': 'DIRECTOR',
+    'EXECUTIVE DIRECTOR': 'EXECUTIVE DIRECTOR',
+    'MANAGING DIRECTOR': 'MANAGING DIRECTOR',
+    'BOARD MEMBER': 'BOARD MEMBER',
+    
+    # VP level
+    'VP': 'VICE PRESIDENT',
+    'VICE PRESIDENT': 'VICE PRESIDENT',
+    'SVP': 'SENIOR VICE PRESIDENT',
+    'SENIOR VICE PRESIDENT': 'SENIOR VICE PRESIDENT',
+    'EVP': 'EXECUTIVE VICE PRESIDENT',
+    'EXECUTIVE VICE PRESIDENT': 'EXECUTIVE VICE PRESIDENT',
+    
+    # Head positions
+    'HEAD': 'HEAD',
+    'DEPARTMENT HEAD': 'DEPARTMENT HEAD',
+    'DIVISION HEAD': 'DIVISION HEAD',
+    
+    # Senior management
+    'GENERAL MANAGER': 'GENERAL MANAGER',
+    'PARTNER': 'PARTNER',
+    'SENIOR MANAGER': 'SENIOR MANAGER',
+    'PRINCIPAL': 'PRINCIPAL',
+    
+    # Founder positions
+    'FOUNDER': 'FOUNDER',
+    'CO-FOUNDER': 'CO-FOUNDER',
+    'OWNER': 'OWNER'
+}
+
+# Word-boundary patterns for each keyword, e.g. 'DIRECTOR' should match
+# 'IT DIRECTOR' but not 'DIRECTORY ADMINISTRATOR'. The last field marks short
+# common words (only 'HEAD') that also need leadership context to count.
+high_position_patterns = [
+    (
+        normalized,
+        re.compile(r'\b' + re.escape(keyword) + r'\b'),
+        keyword in ['HEAD', 'CHIEF', 'OWNER'] and len(keyword) < 5,
+    )
+    for keyword, normalized in high_position_mapping.items()
+]
+
+# Matches any keyword; used to skip titles that cannot be high positions
+high_position_any_re = re.compile(
+    r'\b(?:' + '|'.join(re.escape(keyword) for keyword in high_position_mapping) + r')\b'
+)
+
+# Context words that make a bare 'HEAD' a leadership position
+high_position_context = ['OF', 'DEPARTMENT', 'DIVISION', 'TEAM']
+
+# Position values that mean "no position"
+position_placeholders = ['-', 'N/A', 'NA', 'NONE', 'NOT APPLICABLE', 'UNKNOWN']
+
+# Valid Student IDs: digits, optionally starting with "G" for master's students
+student_id_re = re.compile(r'^[0-9G]\d*$')
+
+# Cell formats shared by the xlsxwriter reports (see create_report_formats)
+header_format_spec = {
+    'bold': True,
+    'bg_color': '#4472C4',
+    'font_color': 'white',
+    'border': 1,
+    'align': 'center'
+}
+cell_format_spec = {
+    'border': 1,
+    'align': 'left'
+}
+number_format_spec = {
+    'border': 1,
+    'align': 'center'
+}
+
+# Field mapping from Banner to Alumni List
+banner_field_mapping = {
+    "Graduation Term": "Year/Semester of Graduation",
+    "Student ID": "Student ID",
+    "Student Name": "Student Name",
+    "College": "College",
+    "Degree": "Degree",
+    "Major": "Major",
+    "Minor": "Minor",
+    "Concentration": "Concentration",
+    "Nationality": "Nationality",
+    "SSN": "SSN",
+    "Gender": "Gender",
+    "Alfaisal Email": "Alfaisal Email",
+    "Personal Email": "Personal Email",
+    "Phone Number": "Phone Number",
+    "Joined AU": "Joining date",
+    "CGPA": "GPA"
+}
+
 # This will be populated dynamically from uploaded Excel files
 graduation_years = []
 
@@ -91,6 +382,13 @@ def clean_status(status):
         return status.strip().lower().capitalize()
     return "Unknown"
 
+def clean_statuses(statuses):
+    """
+    Vectorized clean_status() for a whole Series of status values
+    """
+    # Non-string values come back as NaN from the .str accessor
+    return statuses.str.strip().str.lower().str.capitalize().fillna("Unknown")
+
 def clean_gender(gender):
     """
     Normalize gender values for consistent processing
@@ -115,6 +413,48 @@ def safe_get_column(df, column_name, default_value=""):
         # Create an empty Series of the same length as the dataframe
         return pd.Series([default_value] * len(df), index=df.index)
 
+def count_values(series):
+    """
+    value_counts() that skips categories with no rows, so categorical
+    and plain string columns give the same counts.
+    Values are counted with np.bincount over their integer codes
+    (the category codes, or pd.factorize codes for other columns)
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        codes = series.cat.codes.to_numpy()
+    else:
+        # Codes follow first appearance, so ties keep value_counts() order
+        codes, categories = pd.factorize(series, sort=False)
+    counts = pd.Series(np.bincount(codes[codes >= 0], minlength=len(categories)), index=categories,
+                       name="count", dtype="int64")
+    counts = counts.rename_axis(series.name).sort_values(ascending=False)
+    return counts[counts > 0]
+
+def clone_file(src, dst):
+    """
+    Copy src to dst like shutil.copy2, as a reflink clone when the filesystem supports it
+    """
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), ficlone_request, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass  # Filesystem without reflinks, fall back to a normal copy
+    shutil.copy2(src, dst)
+
+def create_report_formats(workbook):
+    """
+    Create the header, cell and number formats used by the reports in an xlsxwriter workbook
+    """
+    return (
+        workbook.add_format(header_format_spec),
+        workbook.add_format(cell_format_spec),
+        workbook.add_format(number_format_spec),
+    )
+
 def normalize_company_name(name):
     """
     Normalize company names with comprehensive empty value handling
@@ -129,102 +469,17 @@ def normalize_company_name(name):
     # Clean the string
     name = name.strip().upper()
 
-    # Comprehensive empty/unknown patterns
-    empty_patterns = {
-        'COMPLETELY EMPTY': [
-            '', '-', '.', ' ', '...', '*', '#', '//',
-        ],
-        'PLACEHOLDER': [
-            '#N/A', 'N/A', 'NA', 'N.A.', 'N/A.', 'NONE', 'NIL',
-            'NOT APPLICABLE', 'NOT AVAILABLE', 'UNKNOWN',
-        ],
-        'CONFIDENTIAL': [
-            'CONFIDENTIAL', 'CONFIDENTIAL GOVERNMENT', 'GOVERNMENT',
-            'GOVERNMENT SECTOR', 'CONFIDENTIAL (STEALTH MODE)',
-            'CONFIDENTIAL ( STEALTH MODE )', 'CONFIDENTIAL COMPANY',
-            'CANNOT DISCLOSE', 'UNDISCLOSED',
-        ],
-        'OTHERS': [
-            'OTHERS', 'OTHER', 'MISC', 'MISCELLANEOUS', 'TBD',
-            'TO BE DETERMINED', 'PENDING',
-        ],
-        'NOT WORKING': [
-            'NOT WORKING', 'UNEMPLOYED', 'NO JOB', 'NO WORK',
-            'LOOKING FOR JOB', 'SEEKING EMPLOYMENT',
-        ]
-    }
-
     # Check against empty patterns
-    for category, patterns in empty_patterns.items():
-        if name in patterns:
-            return f"EMPTY ({category})"
-
-    # Company aliases
-    company_aliases = {
-        # Banks
-        'SNB': 'SAUDI NATIONAL BANK',
-        'SAUDI NATIONAL BANK': 'SAUDI NATIONAL BANK',
-        'SNB CAPITAL': 'SAUDI NATIONAL BANK',
-        'THE SAUDI NATIONAL BANK': 'SAUDI NATIONAL BANK',
-        'NCB': 'SAUDI NATIONAL BANK',
-        'BSF': 'BANQUE SAUDI FRANSI',
-        'BANQUE SAUDI FRANSI': 'BANQUE SAUDI FRANSI',
-        'BANQUE SAUDI FRANSI CAPITAL': 'BANQUE SAUDI FRANSI',
-        'FRANSI CAPITAL': 'BANQUE SAUDI FRANSI',
-        'SAB': 'SAUDI BRITISH BANK',
-        'SABB': 'SAUDI BRITISH BANK',
-        'BANK SAB': 'SAUDI BRITISH BANK',
-
-        # Government/PIF entities
-        'PIF': 'PUBLIC INVESTMENT FUND',
-        'PUBLIC INVESTMENT FUND - PIF': 'PUBLIC INVESTMENT FUND',
-        'SAMA': 'SAUDI CENTRAL BANK',
-        'SAUDI CENTRAL BANK - SAMA': 'SAUDI CENTRAL BANK',
-        'SIDF': 'SAUDI INDUSTRIAL DEVELOPMENT FUND',
-        'SAUDI INDUSTRIAL DEVELOPMENT FUND - SIDF': 'SAUDI INDUSTRIAL DEVELOPMENT FUND',
-
-        # Consulting firms
-        'BCG': 'BOSTON CONSULTING GROUP',
-        'BOSTON CONSULTING GROUP (BCG)': 'BOSTON CONSULTING GROUP',
-        'EY': 'ERNST & YOUNG',
-        'ERNST & YOUNG (EY)': 'ERNST & YOUNG',
-        'PWC': 'PRICEWATERHOUSECOOPERS',
-
-        # Healthcare
-        'KFSH&RC': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
-        'KFSHRC': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
-        'KFSH': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
-        'KING FAISAL SPECIALIST HOSPITAL': 'KING FAISAL SPECIALIST HOSPITAL & RESEARCH CENTER',
-        'HABIB': 'DR. SULAIMAN AL HABIB MEDICAL GROUP',
-        'DR. SULAIMAN AL HABIB': 'DR. SULAIMAN AL HABIB MEDICAL GROUP',
-
-        # Tech companies
-        'STC': 'SAUDI TELECOM COMPANY',
-        'SAUDI TELECOM': 'SAUDI TELECOM COMPANY',
-        'HPE': 'HEWLETT PACKARD ENTERPRISE',
-        'HEWLETT PACKARD ENTERPRISE - HPE': 'HEWLETT PACKARD ENTERPRISE',
-
-        # Common typos/variations
-        'ARAMCO': 'SAUDI ARAMCO',
-        'SAUDI ARAMCO': 'SAUDI ARAMCO',
-        'SABIC': 'SAUDI BASIC INDUSTRIES CORPORATION',
-        'MINISTRY OF HEALTH': 'MINISTRY OF HEALTH',
-        'MINISTRY OF HEALTH ': 'MINISTRY OF HEALTH',
-    }
+    category = company_empty_lookup.get(name)
+    if category:
+        return f"EMPTY ({category})"
 
     # Try direct match first
     if name in company_aliases:
         return company_aliases[name]
 
     # Remove common words and standardize format
-    remove_words = [
-        'LTD', 'LIMITED', 'CORPORATION', 'CORP', 'INC', 'LLC', 'CO',
-        'COMPANY', 'GROUP', 'HOLDING', 'HOLDINGS', 'INTERNATIONAL',
-        'SAUDI ARABIA', 'KSA', 'MIDDLE EAST'
-    ]
-
-    for word in remove_words:
-        name = name.replace(f' {word}', '')
+    name = company_remove_re.sub('', name)
 
     # Handle special cases with partial matches
     if 'NATIONAL GUARD' in name and 'HEALTH' in name:
@@ -234,27 +489,65 @@ def normalize_company_name(name):
 
     return name.strip()
 
+def normalize_company_names(names):
+    """
+    Vectorized normalize_company_name() for a whole Series of workplace names.
+    Runs the same rules with pandas string ops instead of a Python call per row.
+    """
+    # Non-string values come back as NaN from the .str accessor
+    cleaned = names.str.strip().str.upper()
+    empty_category = cleaned.map(company_empty_lookup)
+    alias_codes = cleaned.astype(company_alias_dtype).cat.codes.to_numpy()
+    alias = pd.Series(np.where(alias_codes >= 0, company_alias_targets[alias_codes], None), index=names.index)
+
+    # Remove common words and standardize format
+    stripped = cleaned.str.replace(company_remove_re, '', regex=True)
+
+    national_guard_health = (
+        stripped.str.contains('NATIONAL GUARD', regex=False, na=False)
+        & stripped.str.contains('HEALTH', regex=False, na=False)
+    )
+    king_fahad_medical = stripped.str.contains('KING FAHAD MEDICAL', regex=False, na=False)
+
+    normalized = np.select(
+        [
+            names.isna(),
+            cleaned.isna(),
+            empty_category.notna(),
+            alias.notna(),
+            national_guard_health,
+            king_fahad_medical,
+        ],
+        [
+            "EMPTY (NULL)",
+            "EMPTY (INVALID TYPE)",
+            "EMPTY (" + empty_category + ")",
+            alias,
+            'MINISTRY OF NATIONAL GUARD HEALTH AFFAIRS',
+            'KING FAHAD MEDICAL CITY',
+        ],
+        default=stripped.str.strip(),
+    )
+    return pd.Series(normalized, index=names.index, dtype=object)
+
 def analyze_unknown_entries(df):
     """
     Analyze the distribution of unknown/empty workplace entries
     """
-    # Create a copy of relevant columns
-    analysis_df = df[['Current Workplace', 'Current Status', '_College', '_Year']].copy()
+    # Select the relevant columns
+    analysis_df = df[['Current Workplace', 'Current Status', '_College', '_Year']]
 
     # Categorize empty/unknown entries
-    def categorize_empty(workplace, status):
-        if not isinstance(workplace, str) or workplace.strip() == '':
-            return "COMPLETELY EMPTY"
-        workplace = workplace.upper().strip()
-        if workplace in ['-', '#N/A', 'N/A', 'NA', 'NONE', 'UNKNOWN']:
-            return f"PLACEHOLDER ({workplace})"
-        if status.upper().strip() in ['UNEMPLOYED', 'STUDYING']:
-            return f"STATUS: {status.upper().strip()}"
-        return "OTHER"
-
-    analysis_df['Empty_Category'] = analysis_df.apply(
-        lambda x: categorize_empty(x['Current Workplace'], x['Current Status']),
-        axis=1
+    workplace = analysis_df['Current Workplace'].str.upper().str.strip()
+    status = analysis_df['Current Status'].str.upper().str.strip()
+    analysis_df['Empty_Category'] = np.select(
+        [
+            workplace.isna() | (workplace == ''),
+            workplace.isin(['-', '#N/A', 'N/A', 'NA', 'NONE', 'UNKNOWN']),
+            status.isin(['UNEMPLOYED', 'STUDYING']),
+        ],
+        ["COMPLETELY EMPTY", "PLACEHOLDER (" + workplace + ")", "STATUS: " + status],
+        default="OTHER",
     )
 
     return analysis_df['Empty_Category'].value_counts()
@@ -271,110 +564,92 @@ def is_high_position(position):
     position = position.strip().upper()
     
     # Skip empty or placeholder values
-    if not position or position in ['-', 'N/A', 'NA', 'NONE', 'NOT APPLICABLE', 'UNKNOWN']:
+    if not position or position in position_placeholders:
         return None
     
-    # Define high position keywords with normalization mapping
-    high_position_mapping = {
-        # C-Suite positions
-        'CEO': 'CHIEF EXECUTIVE OFFICER',
-        'CHIEF EXECUTIVE OFFICER': 'CHIEF EXECUTIVE OFFICER',
-        'PRESIDENT': 'PRESIDENT',
-        'CFO': 'CHIEF FINANCIAL OFFICER',
-        'CHIEF FINANCIAL OFFICER': 'CHIEF FINANCIAL OFFICER',
-        'CTO': 'CHIEF TECHNOLOGY OFFICER',
-        'CHIEF TECHNOLOGY OFFICER': 'CHIEF TECHNOLOGY OFFICER',
-        'CIO': 'CHIEF INFORMATION OFFICER',
-        'CHIEF INFORMATION OFFICER': 'CHIEF INFORMATION OFFICER',
-        'COO': 'CHIEF OPERATING OFFICER',
-        'CHIEF OPERATING OFFICER': 'CHIEF OPERATING OFFICER',
-        'CMO': 'CHIEF MARKETING OFFICER',
-        'CHIEF MARKETING OFFICER': 'CHIEF MARKETING OFFICER',
-        'CHIEF': 'CHIEF',  # Generic chief
-        
-        # Director level
-        'DIRECTOR': 'DIRECTOR',
-        'EXECUTIVE DIRECTOR': 'EXECUTIVE DIRECTOR',
-        'MANAGING DIRECTOR': 'MANAGING DIRECTOR',
-        'BOARD MEMBER': 'BOARD MEMBER',
-        
-        # VP level
-        'VP': 'VICE PRESIDENT',
-        'VICE PRESIDENT': 'VICE PRESIDENT',
-        'SVP': 'SENIOR VICE PRESIDENT',
-        'SENIOR VICE PRESIDENT': 'SENIOR VICE PRESIDENT',
-        'EVP': 'EXECUTIVE VICE PRESIDENT',
-        'EXECUTIVE VICE PRESIDENT': 'EXECUTIVE VICE PRESIDENT',
-        
-        # Head positions
-        'HEAD': 'HEAD',
-        'DEPARTMENT HEAD': 'DEPARTMENT HEAD',
-        'DIVISION HEAD': 'DIVISION HEAD',
-        
-        # Senior management
-        'GENERAL MANAGER': 'GENERAL MANAGER',
-        'PARTNER': 'PARTNER',
-        'SENIOR MANAGER': 'SENIOR MANAGER',
-        'PRINCIPAL': 'PRINCIPAL',
-        
-        # Founder positions
-        'FOUNDER': 'FOUNDER',
-        'CO-FOUNDER': 'CO-FOUNDER',
-        'OWNER': 'OWNER'
-    }
-    
     # Check for exact matches first
     if position in high_position_mapping:
         return high_position_mapping[position]
     
     # Check for partial matches within the position title
-    for keyword, normalized in high_position_mapping.items():
-        # Use word boundaries to avoid partial word matches
-        # e.g., 'DIRECTOR' should match 'IT DIRECTOR' but not 'DIRECTORY ADMINISTRATOR'
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        if re.search(pattern, position):
-            # For common positions like HEAD and CHIEF, ensure it's not just part of another word
-            if keyword in ['HEAD', 'CHIEF', 'OWNER'] and len(keyword) < 5:
+    for normalized, pattern, needs_context in high_position_patterns:
+        # Word boundaries avoid partial word matches
+        if pattern.search(position):
+            # For common positions like HEAD, ensure it's not just part of another word
+            if needs_context:
                 # Additional check to ensure it's actually a leadership position
-                leadership_context = ['OF', 'DEPARTMENT', 'DIVISION', 'TEAM']
-                if any(context in position for context in leadership_context):
+                if any(context in position for context in high_position_context):
                     return normalized
             else:
                 return normalized
     
     return None
 
-def get_workplace_statistics(df, colleges, years, degree_option, gender_option, nationality_option=None):
+def find_high_positions(positions):
+    """
+    Vectorized is_high_position() for a whole Series of job titles.
+    Keywords are checked in the same order, so every title gets the same result.
+    """
+    cleaned = positions.str.strip().str.upper()
+    # Exact matches first
+    high_positions = cleaned.map(high_position_mapping)
+
+    # Only titles containing at least one keyword need the ordered checks
+    is_candidate = high_positions.isna() & cleaned.str.contains(high_position_any_re, na=False)
+    candidates = cleaned[is_candidate]
+    if not candidates.empty:
+        has_context = candidates.str.contains('|'.join(high_position_context), regex=True)
+        conditions = []
+        for normalized, pattern, needs_context in high_position_patterns:
+            found = candidates.str.contains(pattern)
+            if needs_context:
+                found &= has_context
+            conditions.append(found)
+        high_positions[is_candidate] = np.select(
+            conditions, [normalized for normalized, _, _ in high_position_patterns], default=None
+        )
+
+    return high_positions
+
+def get_workplace_statistics(df, colleges, years, degree_option, gender_option, nationality_option=None, columns=None,
+                             as_series=False):
     """
     Generate workplace statistics from the given dataframe.
+    columns is the set of available column names, computed once at load (see load_excel_data).
+    With as_series the counts are returned as Series (for writing to Excel) instead of dicts
     """
+    if columns is None:
+        columns = frozenset(df.columns)
+
     # Filter data based on selections
     mask = df["_College"].isin(colleges) & df["_Year"].isin(years)
 
     if degree_option == "bachelor":
-        mask &= ~df["Student ID"].str.startswith("G", na=False)
+        mask &= ~df["_IsMaster"]
     elif degree_option == "master":
-        mask &= df["Student ID"].str.startswith("G", na=False)
+        mask &= df["_IsMaster"]
 
     # Filter by gender if needed
     if gender_option.lower() != "all":
         # Use normalized gender for filtering
-        if "_Gender" in df.columns:
+        if "_Gender" in columns:
             mask &= (df["_Gender"] == clean_gender(gender_option))
         else:
             mask &= (df["Gender"].str.strip().str.lower() == gender_option.lower())
 
     # Filter by nationality if Saudi is selected, only if the Nationality column exists
     if nationality_option and nationality_option.lower() == "saudi":
-        if "Nationality" in df.columns:
-            mask &= (df["Nationality"].str.strip() == "Saudi Arabia")
+        if "_IsSaudi" in columns:
+            mask &= df["_IsSaudi"]
         else:
-            print("Warning: Nationality column not found, nationality filter ignored")
+            logger.warning("Nationality column not found, nationality filter ignored")
 
-    filtered_df = df[mask].copy()
+    # Only keep the columns the statistics below use
+    used_columns = ["Current Workplace", "Current Position", "Nationality", "Industry", "Full Time or Part Time"]
+    filtered_df = df.loc[mask, [col for col in used_columns if col in columns]]
 
     # Normalize company names
-    filtered_df["Normalized_Workplace"] = filtered_df["Current Workplace"].apply(normalize_company_name)
+    filtered_df["Normalized_Workplace"] = normalize_company_names(filtered_df["Current Workplace"])
 
     # Separate empty and valid entries
     empty_mask = filtered_df["Normalized_Workplace"].str.startswith("EMPTY", na=True)
@@ -382,51 +657,57 @@ def get_workplace_statistics(df, colleges, years, degree_option, gender_option,
     empty_df = filtered_df[empty_mask]
 
     # Get top employers (excluding empty values)
-    top_employers = valid_df["Normalized_Workplace"].value_counts().head(30)
+    top_employers = count_values(valid_df["Normalized_Workplace"]).head(30)
 
     # Get empty value statistics
-    empty_stats = empty_df["Normalized_Workplace"].value_counts()
+    empty_stats = count_values(empty_df["Normalized_Workplace"])
 
     # Get high positions (new implementation)
-    # First, apply the high position detection function to create a new column
-    filtered_df["High_Position"] = filtered_df["Current Position"].apply(is_high_position)
+    # First, run the high position detection over the whole column
+    filtered_df["High_Position"] = find_high_positions(filtered_df["Current Position"])
     
     # Filter only entries that have high positions (non-None values)
     high_position_df = filtered_df[filtered_df["High_Position"].notna()]
     
     # Count occurrences of each high position
-    high_positions = high_position_df["High_Position"].value_counts().head(20)
+    high_positions = count_values(high_position_df["High_Position"]).head(20)
     
     # Get original top positions for backward compatibility
-    top_positions = filtered_df["Current Position"].value_counts().head(10)
+    top_positions = count_values(filtered_df["Current Position"]).head(10)
 
     # Calculate nationality distribution (if Nationality column exists)
-    if "Nationality" in df.columns:
-        nationality_dist = filtered_df["Nationality"].value_counts().head(5)
+    if "Nationality" in columns:
+        nationality_dist = count_values(filtered_df["Nationality"]).head(5)
     else:
         nationality_dist = pd.Series(dtype=int)  # Empty series
 
     # Calculate industry distribution (if Industry column exists)
-    if "Industry" in df.columns:
-        industry_dist = filtered_df["Industry"].value_counts().head(5)
+    if "Industry" in columns:
+        industry_dist = count_values(filtered_df["Industry"]).head(5)
     else:
         industry_dist = pd.Series(dtype=int)  # Empty series
 
     # Calculate employment type distribution (if Full Time or Part Time column exists)
-    if "Full Time or Part Time" in df.columns:
-        employment_type_dist = filtered_df["Full Time or Part Time"].value_counts()
+    if "Full Time or Part Time" in columns:
+        employment_type_dist = count_values(filtered_df["Full Time or Part Time"])
     else:
         employment_type_dist = pd.Series(dtype=int)  # Empty series
 
-    # Convert to dictionaries for JSON serialization
+    counts = {
+        "top_employers": top_employers,
+        "empty_stats": empty_stats,
+        "top_positions": top_positions,
+        "high_positions": high_positions,  # New field for high positions
+        "nationality_dist": nationality_dist,
+        "industry_dist": industry_dist,
+        "employment_type_dist": employment_type_dist,
+    }
+    if not as_series:
+        # Convert to dictionaries for JSON serialization
+        counts = {key: value.to_dict() for key, value in counts.items()}
+
     return {
-        "top_employers": top_employers.to_dict(),
-        "empty_stats": empty_stats.to_dict(),
-        "top_positions": top_positions.to_dict(),
-        "high_positions": high_positions.to_dict(),  # New field for high positions
-        "nationality_dist": nationality_dist.to_dict(),
-        "industry_dist": industry_dist.to_dict(),
-        "employment_type_dist": employment_type_dist.to_dict(),
+        **counts,
         "total_alumni": len(filtered_df),
         "valid_entries": len(valid_df),
         "empty_entries": len(empty_df),
@@ -436,15 +717,35 @@ def get_workplace_statistics(df, colleges, years, degree_option, gender_option,
 # --------------------
 # Data Processing Functions
 # --------------------
+def read_excel_cached(file_path):
+    """
+    Reads an Excel file as strings, reusing the parsed data if a file with the
+    same content was read before
+    """
+    with open(file_path, "rb") as f:
+        key = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+    if key not in excel_cache:
+        # Drop the oldest entry once the cache is full
+        if len(excel_cache) >= excel_cache_size:
+            excel_cache.pop(next(iter(excel_cache)))
+        excel_cache[key] = pd.read_excel(file_path, dtype=str, engine=excel_read_engine)
+
+    # Callers modify the frame, so hand out a (copy-on-write) shallow copy
+    return excel_cache[key].copy(deep=False)
+
 def load_excel_data(file_path, session_id):
     """
     Reads the Excel file and caches it for the session
     """
     try:
-        # Read the Excel file
-        df = pd.read_excel(file_path, dtype=str)
+        # Read the Excel file (cached, so repeated reads of the same file skip the parse)
+        df = read_excel_cached(file_path)
         df.columns = df.columns.str.strip()
 
+        # Extract years from the file before empty values are filled in
+        years_from_file, year_warnings = extract_graduation_years(df, file_path)
+
         # Check if this is a Banner file by looking for Banner-specific columns
         is_banner_file = "Graduation Term" in df.columns and "Student Name" in df.columns
 
@@ -495,6 +796,12 @@ def load_excel_data(file_path, session_id):
         if missing_optional:
             warnings.append(f"The following optional columns are missing: {', '.join(missing_optional)}")
 
+        # Banner data is only used to add new graduates to the Alumni List, so keep just
+        # the columns that get mapped across (Alumni files are kept whole, they are written back)
+        if is_banner_file:
+            used_columns = set(banner_field_mapping) | set(required_columns) | set(optional_columns)
+            df = df[[col for col in df.columns if col in used_columns]]
+
         # Handle missing values for critical columns
         for col in required_columns:
             df[col] = df[col].fillna("").astype(str).str.strip()
@@ -505,9 +812,9 @@ def load_excel_data(file_path, session_id):
                 df[col] = df[col].fillna("").astype(str).str.strip()
 
         # Validate student IDs format (assuming they should be non-empty)
-        invalid_ids = df[(df["Student ID"] != "") & (~df["Student ID"].str.match(r'^[0-9G]\d*$'))]
-        if not invalid_ids.empty:
-            warnings.append(f"Found {len(invalid_ids)} invalid Student IDs")
+        invalid_id_count = (df["Student ID"].ne("") & ~df["Student ID"].str.match(student_id_re)).sum()
+        if invalid_id_count:
+            warnings.append(f"Found {invalid_id_count} invalid Student IDs")
 
         # Create cleaned columns for fast filtering
         df["_College"] = df["College"].str.strip()
@@ -515,11 +822,12 @@ def load_excel_data(file_path, session_id):
             df["_Year"] = df["Graduation Term"].str.strip()
         else:
             df["_Year"] = df["Year/Semester of Graduation"].str.strip()
-            df["_CurrentStatus"] = df["Current Status"].str.strip().str.lower().str.capitalize()
+        if "Nationality" in df.columns:
+            df["_Nationality"] = df["Nationality"].str.strip()
+            df["_IsSaudi"] = df["_Nationality"] == "Saudi Arabia"
+        # Master's students have IDs starting with "G"
+        df["_IsMaster"] = df["Student ID"].str.startswith("G")
 
-        # Extract years from the file
-        years_from_file, year_warnings = extract_graduation_years(file_path)
-        
         # Add any warnings about year extraction
         warnings.extend(year_warnings)
         
@@ -531,6 +839,12 @@ def load_excel_data(file_path, session_id):
             "is_banner": is_banner_file,
             "graduation_years": years_from_file
         }
+        if not is_banner_file:
+            # Keep the table name and style for the Banner integration, which writes this file back
+            try:
+                session_data[session_id]["table_style_info"] = get_table_style_info(file_path)
+            except Exception as e:
+                logger.warning("Could not read table style info from %s: %s", file_path, e)
         
         # Update the global graduation_years if we found values
         global graduation_years
@@ -566,7 +880,7 @@ def load_excel_data(file_path, session_id):
         # Validate Current Status values if not a Banner file
         if not is_banner_file and "Current Status" in df.columns:
             # Normalize the Current Status values for comparison
-            df["_CurrentStatus"] = df["Current Status"].apply(clean_status)
+            df["_CurrentStatus"] = clean_statuses(df["Current Status"])
             
             # Check for unexpected Current Status values
             normalized_expected_statuses = [clean_status(status) for status in expected_current_status]
@@ -624,21 +938,84 @@ def load_excel_data(file_path, session_id):
             "is_banner": is_banner_file
         }
 
+        # Store the filter columns as categoricals so isin/value_counts work on codes
+        for col in ("_College", "_Year", "_CurrentStatus", "_Gender", "_Nationality"):
+            if col in df.columns:
+                df[col] = df[col].astype("category")
+
+        # Remember the available columns so later requests don't have to check them again
+        session_data[session_id]["columns"] = frozenset(df.columns)
+
         return stats
 
     except Exception as e:
         return {"error": f"Error loading data: {str(e)}"}
 
-def extract_graduation_years(file_path):
+@lru_cache(maxsize=32)
+def read_cell_o1(file_path, mtime, size):
     """
-    Extracts graduation years from an Excel file. 
-    Looks for the "Year/Semester of Graduation" column to extract unique year values.
+    Reads cell O1 of the active sheet. mtime and size are only part of the cache key,
+    so a changed file is read again.
     """
+    wb = load_workbook(file_path, read_only=True)
     try:
-        # Read the Excel file
-        df = pd.read_excel(file_path, dtype=str)
-        df.columns = df.columns.str.strip()
+        return wb.active["O1"].value
+    finally:
+        wb.close()
+
+@lru_cache(maxsize=32)
+def read_table_style_info(file_path, mtime, size):
+    """
+    Reads the name and style of the first table on the active sheet straight from the
+    xlsx package parts, without parsing any cells. Returns None if the sheet has no table.
+    mtime and size are only part of the cache key, so a changed file is read again.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        names = set(archive.namelist())
         
+        # Package relationships -> workbook part -> active sheet part
+        workbook_path = next(
+            rel.target for rel in get_dependents(archive, "_rels/.rels")
+            if rel.Type.endswith("/officeDocument")
+        )
+        workbook = WorkbookPackage.from_tree(fromstring(archive.read(workbook_path)))
+        if not workbook.sheets:
+            return None
+        sheet = workbook.sheets[min(workbook.active, len(workbook.sheets) - 1)]
+        sheet_path = get_dependents(archive, get_rels_path(workbook_path)).get(sheet.id).target
+        
+        rels_path = get_rels_path(sheet_path)
+        if rels_path not in names:
+            return None
+        for rel in get_dependents(archive, rels_path).find(table_rel_type):
+            table = Table.from_tree(fromstring(archive.read(rel.target)))
+            style = table.tableStyleInfo
+            return {
+                'name': table.name,
+                'style': None if style is None else {
+                    'name': style.name,
+                    'showFirstColumn': style.showFirstColumn,
+                    'showLastColumn': style.showLastColumn,
+                    'showRowStripes': style.showRowStripes,
+                    'showColumnStripes': style.showColumnStripes
+                }
+            }
+        return None
+
+def get_table_style_info(file_path):
+    """
+    Table name and style of an Excel file (see read_table_style_info)
+    """
+    file_stat = os.stat(file_path)
+    return read_table_style_info(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+
+def extract_graduation_years(df, file_path):
+    """
+    Extracts graduation years from the loaded Excel data.
+    Looks for the "Year/Semester of Graduation" column to extract unique year values,
+    file_path is only opened for the cell O1 fallback.
+    """
+    try:
         if "Year/Semester of Graduation" in df.columns:
             # Extract unique values from the column
             years = df["Year/Semester of Graduation"].dropna().str.strip().unique().tolist()
@@ -648,9 +1025,8 @@ def extract_graduation_years(file_path):
         else:
             # Try to read from cell O1 (as mentioned in the task)
             try:
-                wb = load_workbook(file_path, read_only=True)
-                sheet = wb.active
-                cell_value = sheet["O1"].value
+                file_stat = os.stat(file_path)
+                cell_value = read_cell_o1(file_path, file_stat.st_mtime_ns, file_stat.st_size)
                 if cell_value and "Year/Semester of Graduation" in str(cell_value):
                     # Extract years from elsewhere in the Excel if possible
                     # This might need more specific logic based on the exact Excel structure
@@ -661,133 +1037,110 @@ def extract_graduation_years(file_path):
     except Exception as e:
         return default_graduation_years, [f"Error extracting graduation years: {str(e)}"]
 
+def format_majors(df):
+    """
+    Build the "Major - Degree Type - College" labels as a categorical.
+    Each distinct major/degree/college combination is formatted once and mapped back to the rows
+    """
+    keys = ["Major", "_IsMaster", "College"]
+    groups = df.groupby(keys, sort=False, dropna=False)
+    labels = np.array([
+        f"{major} - {'Masters' if is_master else 'Bachelors'} - {college}"
+        for major, is_master, college in groups.size().index
+    ], dtype=object)
+    return pd.Series(labels[groups.ngroup().to_numpy()], index=df.index, dtype="category")
+
 def create_gender_nationality_breakdown(filtered_df, writer, colleges):
     """
     Create a breakdown sheet showing employed vs unemployed stats by gender and nationality
-    This adds a new sheet to the existing Excel writer
+    This adds a new sheet to the existing xlsxwriter Excel writer
     """
-    # Create a deep copy to avoid modifying the original dataframe
-    breakdown_df = filtered_df.copy(deep=True)
-    
     # Fix for missing columns if they don't exist
-    if "Gender" not in breakdown_df.columns:
-        print("Warning: Gender column not found in dataset")
+    if "Gender" not in filtered_df.columns:
+        logger.warning("Gender column not found in dataset")
         return
-    if "Nationality" not in breakdown_df.columns:
-        print("Warning: Nationality column not found in dataset")
+    if "Nationality" not in filtered_df.columns:
+        logger.warning("Nationality column not found in dataset")
         return
-    if "Current Status" not in breakdown_df.columns:
-        print("Warning: Current Status column not found in dataset")
+    if "Current Status" not in filtered_df.columns:
+        logger.warning("Current Status column not found in dataset")
         return
     
+    # Select just the columns we need (copy-on-write keeps the original dataframe untouched)
+    breakdown_df = filtered_df[["_College", "Gender", "_IsSaudi", "Current Status"]]
+    
     # Create a sheet for gender/nationality breakdown
     sheet_name = "Gender_Nationality_Breakdown"
     
-    # Initialize dataframes to store the results
-    college_results = []
-    
-    # Process each college
-    for college in colleges:
-        college_df = breakdown_df[breakdown_df["College"].str.strip() == college].copy()
-        if college_df.empty:
-            continue
-            
-        # Determine employment status
-        def get_employment_status(status):
-            employed_statuses = [
-                "Employed", "Employed - add to list", "Business owner", 
-                "Training", "Do not contact", "Others", 
-                "Left the country", "Passed away", "New graduate"
-            ]
-            if status in employed_statuses:
-                return "Employed"
-            elif status == "Unemployed":
-                return "Unemployed"
-            elif status == "Studying":
-                return "Studying"
-            else:
-                return "Other"
-        
-        # Properly modify dataframe using .loc to avoid SettingWithCopyWarning        
-        college_df.loc[:, "Employment Status"] = college_df["Current Status"].apply(get_employment_status)
-        
-        # Filter to just employed, unemployed, and studying and create a new dataframe
-        emp_df = college_df[college_df["Employment Status"].isin(["Employed", "Unemployed", "Studying"])].copy()
-        
-        if emp_df.empty:
-            continue
-            
-        # Create nationality category using .loc to avoid warning
-        emp_df.loc[:, "Nationality Category"] = emp_df["Nationality"].fillna("").apply(
-            lambda x: "Saudi" if x.strip() == "Saudi Arabia" else "Non-Saudi"
-        )
-        
-        # Group by Gender, Nationality Category and Employment Status
+    # Determine employment status
+    status = breakdown_df["Current Status"]
+    breakdown_df["Employment Status"] = np.select(
+        [status.isin(employed_statuses), status == "Unemployed", status == "Studying"],
+        ["Employed", "Unemployed", "Studying"],
+        default="Other",
+    )
+
+    # Create nationality category
+    breakdown_df["Nationality Category"] = np.where(breakdown_df["_IsSaudi"], "Saudi", "Non-Saudi")
+
+    # The college order of the categorical keeps the sheet in the order the colleges were selected
+    breakdown_df["College"] = breakdown_df["_College"].cat.set_categories(list(dict.fromkeys(colleges)))
+    breakdown_df["Gender"] = breakdown_df["Gender"].astype("category")
+
+    # Filter to the selected colleges and just employed, unemployed, and studying
+    emp_df = breakdown_df[breakdown_df["College"].notna() & (breakdown_df["Employment Status"] != "Other")]
+
+    # Count by College, Gender, Nationality Category and Employment Status in one pass
+    if not emp_df.empty:
         try:
-            grouped = emp_df.groupby(["Gender", "Nationality Category", "Employment Status"]).size().unstack(
-                fill_value=0
-            ).reset_index()
-            
-            # Ensure all status columns exist
-            if "Employed" not in grouped.columns:
-                grouped["Employed"] = 0
-            if "Unemployed" not in grouped.columns:
-                grouped["Unemployed"] = 0
-            if "Studying" not in grouped.columns:
-                grouped["Studying"] = 0
-                
+            all_results = (
+                emp_df.groupby(["College", "Gender", "Nationality Category", "Employment Status"], observed=True)
+                .size()
+                .unstack(fill_value=0)
+                # Ensure all status columns exist
+                .reindex(columns=["Employed", "Unemployed", "Studying"], fill_value=0)
+                .reset_index()
+            )
+            all_results["College"] = all_results["College"].astype(str)
+
             # Calculate totals and percentages
-            grouped["Total"] = grouped["Employed"] + grouped["Unemployed"] + grouped["Studying"]
-            grouped["Employed %"] = (grouped["Employed"] / grouped["Total"] * 100).fillna(0).round(2)
-            grouped["Unemployed %"] = (grouped["Unemployed"] / grouped["Total"] * 100).fillna(0).round(2)
-            grouped["Studying %"] = (grouped["Studying"] / grouped["Total"] * 100).fillna(0).round(2)
-            
-            # Add college name for multi-college display
-            grouped["College"] = college
-            
-            college_results.append(grouped)
-        except Exception as e:
-            print(f"Error processing college {college}: {str(e)}")
-            continue
-    
-    # Combine all results
-    if college_results:
-        try:
-            all_results = pd.concat(college_results)
+            all_results["Total"] = all_results["Employed"] + all_results["Unemployed"] + all_results["Studying"]
+            all_results["Employed %"] = (all_results["Employed"] / all_results["Total"] * 100).fillna(0).round(2)
+            all_results["Unemployed %"] = (all_results["Unemployed"] / all_results["Total"] * 100).fillna(0).round(2)
+            all_results["Studying %"] = (all_results["Studying"] / all_results["Total"] * 100).fillna(0).round(2)
             
             # Reorganize for better readability
             all_results = all_results[["College", "Gender", "Nationality Category", 
                                     "Employed", "Unemployed", "Studying", "Total", 
                                     "Employed %", "Unemployed %", "Studying %"]]
             
-            # Write to Excel
-            all_results.to_excel(writer, sheet_name=sheet_name, index=False)
+            # Write to Excel row by row, with the same header style pandas uses
+            worksheet = writer.book.add_worksheet(sheet_name)
+            header_format = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+            worksheet.write_row(0, 0, all_results.columns, header_format)
+            for row_num, row in enumerate(all_results.itertuples(index=False, name=None), start=1):
+                worksheet.write_row(row_num, 0, row)
             
-            # Format the sheet
-            worksheet = writer.sheets[sheet_name]
+            # Format the sheet - auto-adjust column widths
+            value_lengths = all_results.astype(str).apply(lambda column: column.str.len().max())
             for idx, col in enumerate(all_results.columns):
-                # Auto-adjust column width
-                max_len = max(all_results[col].astype(str).map(len).max(), len(col)) + 2
-                worksheet.set_column(idx, idx, max_len)
+                worksheet.set_column(idx, idx, max(value_lengths[col], len(col)) + 2)
                 
             # Add a title
             worksheet.write(all_results.shape[0] + 2, 0, "Gender and Nationality Employment Breakdown")
             worksheet.write(all_results.shape[0] + 3, 0, "Note: This breakdown shows employed vs. unemployed alumni by gender and nationality.")
-            print("Successfully created gender/nationality breakdown sheet")
+            logger.debug("Successfully created gender/nationality breakdown sheet")
         except Exception as e:
-            print(f"Error creating breakdown sheet: {str(e)}")
+            logger.error("Error creating breakdown sheet: %s", e)
 
 def create_nationality_breakdown(filtered_df, writer, colleges):
     """
     Create a nationality breakdown sheet showing count of graduates per nationality
     This adds a new sheet to the existing Excel writer
     """
-    # Create a deep copy to avoid modifying the original dataframe
-    breakdown_df = filtered_df.copy(deep=True)
-    
     # Check if Nationality column exists
-    if "Nationality" not in breakdown_df.columns:
-        print("Warning: Nationality column not found in dataset")
+    if "Nationality" not in filtered_df.columns:
+        logger.warning("Nationality column not found in dataset")
         return
     
     # Create a sheet for nationality breakdown
@@ -795,7 +1148,7 @@ def create_nationality_breakdown(filtered_df, writer, colleges):
     
     try:
         # Clean and count nationalities
-        nationality_counts = breakdown_df["Nationality"].fillna("Unknown").str.strip()
+        nationality_counts = filtered_df["Nationality"].fillna("Unknown").str.strip()
         nationality_counts = nationality_counts.value_counts().reset_index()
         nationality_counts.columns = ["Nationality", "Count"]
         
@@ -814,13 +1167,28 @@ def create_nationality_breakdown(filtered_df, writer, colleges):
             worksheet.set_column(idx, idx, max_len)
         
         # Add a title and note
-        total_graduates = len(breakdown_df)
+        total_graduates = len(filtered_df)
         worksheet.write(nationality_counts.shape[0] + 2, 0, f"Overall Nationality Breakdown - Total Graduates: {total_graduates}")
         worksheet.write(nationality_counts.shape[0] + 3, 0, "Note: This breakdown shows the count of graduates by nationality.")
-        print("Successfully created nationality breakdown sheet")
+        logger.debug("Successfully created nationality breakdown sheet")
         
     except Exception as e:
-        print(f"Error creating nationality breakdown sheet: {str(e)}")
+        logger.error("Error creating nationality breakdown sheet: %s", e)
+
+def write_employment_report(writer, sheet_name, grouped, employment_stats):
+    """
+    Write the status counts and the employment stats side by side, two blank columns apart,
+    each with an "Overall Total" row. Returns the number of rows written below the header
+    """
+    # Unnamed index so the header cell above the majors stays blank
+    grouped = grouped.rename_axis(None)
+    grouped.loc["Overall Total"] = grouped.sum(axis=0)
+    employment_stats = employment_stats.rename_axis(None)
+    employment_stats.loc["Overall Total"] = employment_stats.sum(axis=0)
+
+    grouped.to_excel(writer, sheet_name=sheet_name)
+    employment_stats.to_excel(writer, sheet_name=sheet_name, startcol=len(grouped.columns) + 3, index=False)
+    return grouped.shape[0]
 
 def process_qaa_report(session_id, colleges, years, degree_option, combine_all, combine_years, gender_option, nationality_option=None, mode_option="detailed"):
     """Generate QAA report based on given parameters"""
@@ -828,41 +1196,47 @@ def process_qaa_report(session_id, colleges, years, degree_option, combine_all,
         if session_id not in session_data:
             return {"error": "No data found for your session. Please upload an Excel file first."}
 
-        df = session_data[session_id]["data"].copy()
+        df = session_data[session_id]["data"]
         
         # Add this line to normalize Current Status before grouping - THIS IS THE KEY FIX
-        df["Current Status"] = df["Current Status"].apply(clean_status)
+        # (assign returns a new frame, so the session data is left as loaded). The statuses are
+        # a categorical so the groupbys below hash small integer codes instead of strings
+        df = df.assign(**{"Current Status": clean_statuses(df["Current Status"]).astype("category")})
         
-        # Filter based on selections - make a copy for the gender/nationality breakdown that doesn't filter by gender/nationality
-        filtered_df_all = df[df["_College"].isin(colleges)]
-        filtered_df_all = filtered_df_all[filtered_df_all["_Year"].isin(years)]
+        # Build the filters as boolean masks and slice once. The gender/nationality breakdown
+        # uses the data without the gender/nationality filters
+        mask = df["_College"].isin(colleges) & df["_Year"].isin(years)
         
         # For Simple mode, ignore all filters except colleges and years
         if mode_option == "simple":
-            filtered_df = filtered_df_all.copy()
+            filtered_df_all = df[mask]
+            filtered_df = filtered_df_all
         else:
             # Apply degree filter to the full dataset too
             if degree_option == "bachelor":
-                filtered_df_all = filtered_df_all[~filtered_df_all["Student ID"].str.startswith("G", na=False)]
+                mask &= ~df["_IsMaster"]
             elif degree_option == "master":
-                filtered_df_all = filtered_df_all[filtered_df_all["Student ID"].str.startswith("G", na=False)]
+                mask &= df["_IsMaster"]
+            filtered_df_all = df[mask]
                 
             # Filter based on selections for the original report
-            filtered_df = filtered_df_all.copy()
+            report_mask = mask
             
             # Filter by gender if needed
             if gender_option.lower() != "all":
                 # Use normalized gender for filtering
-                if "_Gender" in filtered_df.columns:
-                    filtered_df = filtered_df[filtered_df["_Gender"] == clean_gender(gender_option)]
+                if "_Gender" in df.columns:
+                    report_mask = report_mask & (df["_Gender"] == clean_gender(gender_option))
                 else:
-                    filtered_df = filtered_df[filtered_df["Gender"].str.strip().str.lower() == gender_option.lower()]
+                    report_mask = report_mask & (df["Gender"].str.strip().str.lower() == gender_option.lower())
 
             # Filter by nationality if selected
             if nationality_option and nationality_option.lower() == "saudi":
-                filtered_df = filtered_df[filtered_df["Nationality"].str.strip() == "Saudi Arabia"]
+                report_mask = report_mask & df["_IsSaudi"]
             elif nationality_option and nationality_option.lower() == "non-saudi":
-                filtered_df = filtered_df[filtered_df["Nationality"].str.strip() != "Saudi Arabia"]
+                report_mask = report_mask & ~df["_IsSaudi"]
+
+            filtered_df = filtered_df_all if report_mask is mask else df[report_mask]
 
         if filtered_df.empty:
             return {"error": "No matching data found for the given filters."}
@@ -875,24 +1249,15 @@ def process_qaa_report(session_id, colleges, years, degree_option, combine_all,
         if mode_option == "simple":
             return process_simple_mode_report(filtered_df_all, colleges, years, file_path, output_file)
         
-        # Use formatted majors if needed
+        # Use formatted majors if needed (Major and College are already stripped at load)
         use_formatted_majors = combine_all or (degree_option == "all")
         if use_formatted_majors:
-            filtered_df["Degree Type"] = filtered_df["Student ID"].apply(
-                lambda sid: "Masters" if (isinstance(sid, str) and sid.strip().startswith("G")) else "Bachelors"
-            )
-            filtered_df["MajorFormatted"] = filtered_df["Major"].str.strip() + " - " + filtered_df["Degree Type"] + " - " + filtered_df["College"].str.strip()
-            
-            # Also add to the full dataset for the breakdown
-            filtered_df_all["Degree Type"] = filtered_df_all["Student ID"].apply(
-                lambda sid: "Masters" if (isinstance(sid, str) and sid.strip().startswith("G")) else "Bachelors"
-            )
-            filtered_df_all["MajorFormatted"] = filtered_df_all["Major"].str.strip() + " - " + filtered_df_all["Degree Type"] + " - " + filtered_df_all["College"].str.strip()
+            filtered_df["MajorFormatted"] = format_majors(filtered_df)
 
         with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
             if combine_all:
                 group_col = "MajorFormatted" if use_formatted_majors else "Major"
-                grouped = filtered_df.groupby([group_col, "Current Status"]).size().unstack(fill_value=0)
+                grouped = filtered_df.groupby([group_col, "Current Status"], observed=True).size().unstack(fill_value=0)
                 grouped["Total"] = grouped.sum(axis=1)
                 
                 # Calculate overall total for reference
@@ -900,17 +1265,7 @@ def process_qaa_report(session_id, colleges, years, degree_option, combine_all,
 
                 # Employment stats calculation - MATCH DESKTOP VERSION
                 employment_stats = pd.DataFrame(index=grouped.index)
-                employment_stats["Employed"] = (
-                    grouped.get("Employed", 0) +
-                    grouped.get("Employed - add to list", 0) +
-                    grouped.get("Business owner", 0) +
-                    grouped.get("Training", 0) +
-                    grouped.get("Do not contact", 0) +
-                    grouped.get("Others", 0) +
-                    grouped.get("Left the country", 0) +
-                    grouped.get("Passed away", 0) +
-                    grouped.get("New graduate", 0)
-                )
+                employment_stats["Employed"] = grouped.reindex(columns=employed_statuses, fill_value=0).sum(axis=1)
                 employment_stats["Unemployed"] = grouped.get("Unemployed", 0)
                 employment_stats["Studying"] = grouped.get("Studying", 0)
 
@@ -919,54 +1274,35 @@ def process_qaa_report(session_id, colleges, years, degree_option, combine_all,
                 employment_stats["Unemployed Percentage"] = (employment_stats["Unemployed"] / overall_total * 100).fillna(0).round(2)
                 employment_stats["Studying Percentage"] = (employment_stats["Studying"] / overall_total * 100).fillna(0).round(2)
 
-                empty_columns = pd.DataFrame(index=grouped.index, columns=["", " "])
-                final_report = pd.concat([grouped, empty_columns, employment_stats], axis=1)
-                
                 # Calculate summary row MATCHING desktop version's approach
-                summary_row = final_report.sum(axis=0).to_frame().T
-                summary_row.index = ["Overall Total"]
-                final_report = pd.concat([final_report, summary_row])
-                
-                final_report.to_excel(writer, sheet_name="Combined_Report")
+                num_rows = write_employment_report(writer, "Combined_Report", grouped, employment_stats)
 
                 worksheet = writer.sheets["Combined_Report"]
-                num_rows = final_report.shape[0]
-                unique_years = sorted(set(filtered_df["Year/Semester of Graduation"].dropna().str.strip()))
+                unique_years = sorted(filtered_df["_Year"].unique())
                 worksheet.write(num_rows + 5, 0, "Academic Years:")
                 worksheet.write(num_rows + 5, 1, ", ".join(unique_years))
 
             elif combine_years:
                 # Similar changes as above for the combine_years section
-                college_abbreviations = {
-                    "College of Engineering & Advan": "CoE",
-                    "College of Business": "CoB",
-                    "College of Medicine": "CoM",
-                    "College of Pharmacy": "CoP",
-                    "College of Science & General S": "CoS"
-                }
+                # Count every college in one groupby, then split the counts per college
+                group_col = "MajorFormatted" if use_formatted_majors else "Major"
+                counts = filtered_df.groupby(["_College", group_col, "Current Status"], observed=True).size().unstack(fill_value=0)
+                college_counts = {college: block.droplevel(0) for college, block in counts.groupby(level=0, observed=True)}
+                college_years = filtered_df.groupby("_College", observed=True)["_Year"].unique()
+
                 for college in colleges:
-                    college_df = filtered_df[filtered_df["College"].str.strip() == college]
-                    if college_df.empty:
+                    if college not in college_counts:
                         continue
 
-                    group_col = "MajorFormatted" if use_formatted_majors else "Major"
-                    grouped = college_df.groupby([group_col, "Current Status"]).size().unstack(fill_value=0)
+                    # Keep only the statuses that occur for this college
+                    grouped = college_counts[college]
+                    grouped = grouped.loc[:, grouped.any()].copy()
                     grouped["Total"] = grouped.sum(axis=1)
                     
                     overall_total = grouped["Total"].sum()
 
                     employment_stats = pd.DataFrame(index=grouped.index)
-                    employment_stats["Employed"] = (
-                        grouped.get("Employed", 0) +
-                        grouped.get("Employed - add to list", 0) +
-                        grouped.get("Business owner", 0) +
-                        grouped.get("Training", 0) +
-                        grouped.get("Do not contact", 0) +
-                        grouped.get("Others", 0) +
-                        grouped.get("Left the country", 0) +
-                        grouped.get("Passed away", 0) +
-                        grouped.get("New graduate", 0)
-                    )
+                    employment_stats["Employed"] = grouped.reindex(columns=employed_statuses, fill_value=0).sum(axis=1)
                     employment_stats["Unemployed"] = grouped.get("Unemployed", 0)
                     employment_stats["Studying"] = grouped.get("Studying", 0)
 
@@ -974,57 +1310,34 @@ def process_qaa_report(session_id, colleges, years, degree_option, combine_all,
                     employment_stats["Unemployed Percentage"] = (employment_stats["Unemployed"] / overall_total * 100).fillna(0).round(2)
                     employment_stats["Studying Percentage"] = (employment_stats["Studying"] / overall_total * 100).fillna(0).round(2)
 
-                    empty_columns = pd.DataFrame(index=grouped.index, columns=["", " "])
-                    final_report = pd.concat([grouped, empty_columns, employment_stats], axis=1)
-                    
-                    summary_row = final_report.sum(axis=0).to_frame().T
-                    summary_row.index = ["Overall Total"]
-                    final_report = pd.concat([final_report, summary_row])
-
                     sheet_name = college_abbreviations.get(college.strip(), college[:25])
-                    final_report.to_excel(writer, sheet_name=sheet_name)
+                    num_rows = write_employment_report(writer, sheet_name, grouped, employment_stats)
 
                     worksheet = writer.sheets[sheet_name]
-                    num_rows = final_report.shape[0]
-                    unique_years = sorted(set(college_df["Year/Semester of Graduation"].dropna().str.strip()))
+                    unique_years = sorted(college_years[college])
                     worksheet.write(num_rows + 5, 0, "Academic Years:")
                     worksheet.write(num_rows + 5, 1, ", ".join(unique_years))
             else:
                 # Similar changes for the individual sheets by college and year
-                college_abbreviations = {
-                    "College of Engineering & Advan": "CoE",
-                    "College of Business": "CoB",
-                    "College of Science & General S": "CoS",
-                    "College of Medicine": "CoM",
-                    "College of Pharmacy": "CoP"
-                }
+                # Count every college and year in one groupby, then split the counts per sheet
+                group_col = "MajorFormatted" if use_formatted_majors else "Major"
+                counts = filtered_df.groupby(["_College", "_Year", group_col, "Current Status"], observed=True).size().unstack(fill_value=0)
+                sheet_counts = {key: block.droplevel([0, 1]) for key, block in counts.groupby(level=[0, 1], observed=True)}
+
                 for college in colleges:
-                    college_df = filtered_df[filtered_df["College"].str.strip() == college]
-                    if college_df.empty:
-                        continue
-                    group_col = "MajorFormatted" if use_formatted_majors else "Major"
                     for year in years:
-                        year_df = college_df[college_df["Year/Semester of Graduation"].str.strip() == year]
-                        if year_df.empty:
+                        if (college, year) not in sheet_counts:
                             continue
 
-                        grouped = year_df.groupby([group_col, "Current Status"]).size().unstack(fill_value=0)
+                        # Keep only the statuses that occur for this college and year
+                        grouped = sheet_counts[(college, year)]
+                        grouped = grouped.loc[:, grouped.any()].copy()
                         grouped["Total"] = grouped.sum(axis=1)
                         
                         overall_total = grouped["Total"].sum()
 
                         employment_stats = pd.DataFrame(index=grouped.index)
-                        employment_stats["Employed"] = (
-                            grouped.get("Employed", 0) +
-                            grouped.get("Employed - add to list", 0) +
-                            grouped.get("Business owner", 0) +
-                            grouped.get("Training", 0) +
-                            grouped.get("Do not contact", 0) +
-                            grouped.get("Others", 0) +
-                            grouped.get("Left the country", 0) +
-                            grouped.get("Passed away", 0) +
-                            grouped.get("New graduate", 0)
-                        )
+                        employment_stats["Employed"] = grouped.reindex(columns=employed_statuses, fill_value=0).sum(axis=1)
                         employment_stats["Unemployed"] = grouped.get("Unemployed", 0)
                         employment_stats["Studying"] = grouped.get("Studying", 0)
 
@@ -1032,44 +1345,32 @@ def process_qaa_report(session_id, colleges, years, degree_option, combine_all,
                         employment_stats["Unemployed Percentage"] = (employment_stats["Unemployed"] / overall_total * 100).fillna(0).round(2)
                         employment_stats["Studying Percentage"] = (employment_stats["Studying"] / overall_total * 100).fillna(0).round(2)
 
-                        empty_columns = pd.DataFrame(index=grouped.index, columns=["", " "])
-                        final_report = pd.concat([grouped, empty_columns, employment_stats], axis=1)
-                        
-                        summary_row = final_report.sum(axis=0).to_frame().T
-                        summary_row.index = ["Overall Total"]
-                        final_report = pd.concat([final_report, summary_row])
-
                         random_suffix = ''.join(re.findall(r'\w', uuid.uuid4().hex))[:3]
                         sheet_name = f"{college_abbreviations.get(college.strip(), college[:15])} - {year} - {random_suffix}"
                         if len(sheet_name) > 31:  # Excel sheet name length limit
                             sheet_name = sheet_name[:31]
-                        final_report.to_excel(writer, sheet_name=sheet_name)
+                        num_rows = write_employment_report(writer, sheet_name, grouped, employment_stats)
 
                         worksheet = writer.sheets[sheet_name]
-                        num_rows = final_report.shape[0]
                         worksheet.write(num_rows + 5, 0, "Academic Year:")
                         worksheet.write(num_rows + 5, 1, year)
 
-        # Add a separate with block to ensure the workbook is properly saved with our gender/nationality breakdown
-        # Must save the workbook above first to avoid sharing violations
-
-        # Now create a new excel writer to add our breakdown sheet
-        breakdown_file = file_path
-        try:
-            # Use a new writer to add the gender/nationality breakdown sheet
-            with pd.ExcelWriter(breakdown_file, engine="openpyxl", mode="a") as breakdown_writer:
-                if not filtered_df_all.empty:
-                    # Create the gender/nationality breakdown sheet after the regular reports are done
-                    print("Adding gender/nationality breakdown sheet...")
-                    create_gender_nationality_breakdown(filtered_df_all, breakdown_writer, colleges)
-                    print("Breakdown sheet added successfully")
-                    
-                    # Create the overall nationality breakdown sheet
-                    print("Adding overall nationality breakdown sheet...")
-                    create_nationality_breakdown(filtered_df_all, breakdown_writer, colleges)
-                    print("Overall nationality breakdown sheet added successfully")
-        except Exception as e:
-            print(f"Failed to create gender/nationality breakdown: {str(e)}")
+            # Create the breakdown sheets after the regular reports are done, in the same
+            # writer so the workbook is written once instead of reopened in append mode
+            if not filtered_df_all.empty:
+                try:
+                    logger.debug("Adding gender/nationality breakdown sheet...")
+                    create_gender_nationality_breakdown(filtered_df_all, writer, colleges)
+                    logger.debug("Breakdown sheet added successfully")
+                except Exception as e:
+                    logger.error("Failed to create gender/nationality breakdown: %s", e)
+
+                try:
+                    logger.debug("Adding overall nationality breakdown sheet...")
+                    create_nationality_breakdown(filtered_df_all, writer, colleges)
+                    logger.debug("Overall nationality breakdown sheet added successfully")
+                except Exception as e:
+                    logger.error("Failed to create nationality breakdown: %s", e)
             
         return {
             "status": "success",
@@ -1083,36 +1384,7 @@ def process_qaa_report(session_id, colleges, years, degree_option, combine_all,
 def process_simple_mode_report(filtered_df, colleges, years, file_path, output_file):
     """Generate Simple mode QAA report - just totals by college/year with gender breakdown"""
     try:
-        # Helper function to extract academic year from graduation term
-        def extract_academic_year(graduation_term):
-            """Extract academic year (e.g., '2013-2014') from graduation term"""
-            if pd.isna(graduation_term) or not isinstance(graduation_term, str):
-                return "Unknown"
-            
-            # Look for patterns like "2013-2014", "2013-14", or just "2013"
-            import re
-            
-            # Pattern for full academic year like "2013-2014"
-            match = re.search(r'(\d{4})-(\d{4})', graduation_term)
-            if match:
-                return f"{match.group(1)}-{match.group(2)}"
-            
-            # Pattern for short academic year like "2013-14"
-            match = re.search(r'(\d{4})-(\d{2})', graduation_term)
-            if match:
-                return f"{match.group(1)}-20{match.group(2)}"
-            
-            # Pattern for single year - assume it's the ending year
-            match = re.search(r'(\d{4})', graduation_term)
-            if match:
-                year = int(match.group(1))
-                prev_year = year - 1
-                return f"{prev_year}-{year}"
-            
-            return "Unknown"
-        
         # Normalize text data for case-insensitive comparisons
-        filtered_df = filtered_df.copy()  # Make sure we're working with a copy
         # Use the already normalized gender column if available, otherwise create it
         if "_Gender" in filtered_df.columns:
             filtered_df["Gender_Normalized"] = filtered_df["_Gender"].str.upper()
@@ -1120,71 +1392,55 @@ def process_simple_mode_report(filtered_df, colleges, years, file_path, output_f
             filtered_df["Gender_Normalized"] = filtered_df["Gender"].str.strip().str.upper()
         filtered_df["College_Normalized"] = filtered_df["_College"].str.strip()
         
-        # Add academic year column
-        filtered_df["Academic_Year"] = filtered_df["_Year"].apply(extract_academic_year)
+        # Add academic year column (e.g., '2013-2014') from "2013-2014", "2013-14" or just "2013"
+        terms = filtered_df["_Year"].astype("string")
+        full_match = terms.str.extract(r'(\d{4})-(\d{4})')
+        short_match = terms.str.extract(r'(\d{4})-(\d{2})')
+        single_match = terms.str.extract(r'(\d{4})')[0]
+        # A single year is assumed to be the ending year
+        single_year = pd.to_numeric(single_match).astype("Int64")
+        filtered_df["Academic_Year"] = np.select(
+            [full_match[0].notna(), short_match[0].notna(), single_match.notna()],
+            [full_match[0] + "-" + full_match[1],
+             short_match[0] + "-20" + short_match[1],
+             (single_year - 1).astype("string") + "-" + single_year.astype("string")],
+            default="Unknown"
+        )
         
         # Get unique academic years, sorted
         academic_years = sorted(filtered_df["Academic_Year"].unique())
         
+        # Count graduates by academic year, college and gender in one pass
+        keys = ["Academic_Year", "College_Normalized"]
+        year_summary = filtered_df.groupby(keys, sort=False, observed=True).size().to_frame("Total Graduates")
+        gender_counts = (
+            filtered_df.groupby(keys + ["Gender_Normalized"], sort=False, observed=True).size()
+            .unstack(fill_value=0)
+            .reindex(index=year_summary.index, columns=["MALE", "FEMALE"], fill_value=0)
+        )
+        year_summary["Gentlemen"] = gender_counts["MALE"]
+        year_summary["Ladies"] = gender_counts["FEMALE"]
+        year_summary.index = year_summary.index.set_names("College", level="College_Normalized")
+        
         with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
             workbook = writer.book
             
             # Create formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#4472C4',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center'
-            })
-            cell_format = workbook.add_format({
-                'border': 1,
-                'align': 'left'
-            })
-            number_format = workbook.add_format({
-                'border': 1,
-                'align': 'center'
-            })
+            header_format, cell_format, number_format = create_report_formats(workbook)
             
             # Create one sheet per academic year
             for academic_year in academic_years:
                 if academic_year == "Unknown":
                     continue  # Skip unknown years
                     
-                # Filter data for this academic year
-                year_df = filtered_df[filtered_df["Academic_Year"] == academic_year]
-                
-                if year_df.empty:
+                if academic_year not in year_summary.index:
                     continue
                 
-                # Create summary by college and gender
-                summary_data = []
-                
-                # Get all colleges that have data for this year
-                colleges_with_data = year_df["College_Normalized"].unique()
+                # Colleges with data for this year, in order of first appearance
+                summary_df = year_summary.loc[academic_year].reset_index()
                 
-                for college in colleges_with_data:
-                    college_df = year_df[year_df["College_Normalized"] == college]
-                    
-                    # Total graduates for this college
-                    total_graduates = len(college_df)
-                    
-                    # Gender breakdown (case-insensitive)
-                    gender_counts = college_df["Gender_Normalized"].value_counts()
-                    gentlemen = gender_counts.get("MALE", 0)
-                    ladies = gender_counts.get("FEMALE", 0)
-                    
-                    summary_data.append({
-                        "College": college,
-                        "Total Graduates": total_graduates,
-                        "Gentlemen": gentlemen,
-                        "Ladies": ladies
-                    })
-                
-                # Create DataFrame and write to Excel
-                if summary_data:
-                    summary_df = pd.DataFrame(summary_data)
-                    
+                # Write to Excel
+                if not summary_df.empty:
                     # Clean sheet name (Excel has 31 character limit)
                     sheet_name = academic_year.replace("-", "_")[:31]
                     
@@ -1221,43 +1477,21 @@ def process_simple_mode_report(filtered_df, colleges, years, file_path, output_f
 def create_all_years_summary_tab(filtered_df, writer, workbook, header_format, number_format):
     """Create the 'All years summary' tab with college/gender and nationality breakdowns"""
     try:
-        # Group data by college for overall summary
-        summary_data = []
-        
-        # Get all colleges that have data across all years
-        colleges_with_data = filtered_df["College_Normalized"].unique()
-        
-        for college in colleges_with_data:
-            college_df = filtered_df[filtered_df["College_Normalized"] == college]
-            
-            # Total graduates for this college
-            total_graduates = len(college_df)
-            
-            # Gender breakdown (case-insensitive)
-            gender_counts = college_df["Gender_Normalized"].value_counts()
-            gentlemen = gender_counts.get("MALE", 0)
-            ladies = gender_counts.get("FEMALE", 0)
-            
-            # Nationality breakdown (case-insensitive)
-            # Normalize nationality data
-            nationality_normalized = college_df["Nationality"].fillna("").str.strip()
-            saudi_count = len(nationality_normalized[nationality_normalized == "Saudi Arabia"])
-            non_saudi_count = total_graduates - saudi_count
-            
-            summary_data.append({
-                "College": college,
-                "Total Graduates": total_graduates,
-                "Ladies": ladies,
-                "Gentlemen": gentlemen,
-                "Saudi": saudi_count,
-                "Non-Saudi": non_saudi_count
-            })
-        
-        if not summary_data:
+        # Count graduates, gender and nationality for every college in one groupby,
+        # keeping the colleges in order of first appearance
+        gender = filtered_df["Gender_Normalized"]
+        summary_df = pd.DataFrame({
+            "Total Graduates": 1,
+            "Ladies": gender == "FEMALE",
+            "Gentlemen": gender == "MALE",
+            "Saudi": filtered_df["_IsSaudi"],
+        }, index=filtered_df.index).groupby(filtered_df["College_Normalized"].rename("College"), sort=False).sum()
+        
+        if summary_df.empty:
             return
-            
-        # Create DataFrame
-        summary_df = pd.DataFrame(summary_data)
+        
+        summary_df["Non-Saudi"] = summary_df["Total Graduates"] - summary_df["Saudi"]
+        summary_df = summary_df.reset_index()
         
         # Write to "All years summary" sheet
         sheet_name = "All years summary"
@@ -1285,34 +1519,25 @@ def create_all_years_summary_tab(filtered_df, writer, workbook, header_format, n
         worksheet.write(1, col_saudi, "Saudi", header_format)
         worksheet.write(1, col_non_saudi, "Non-Saudi", header_format)
         
-        # Write data rows
-        for idx, row in summary_df.iterrows():
+        # Write data rows (the summary columns are laid out left to right from col_college)
+        for idx, row in enumerate(summary_df.itertuples(index=False, name=None)):
             row_num = idx + 2  # Start from row 2 (0-indexed)
-            
-            worksheet.write(row_num, col_college, row["College"], number_format)
-            worksheet.write(row_num, col_total, row["Total Graduates"], number_format)
-            worksheet.write(row_num, col_ladies, row["Ladies"], number_format)
-            worksheet.write(row_num, col_gentlemen, row["Gentlemen"], number_format)
-            worksheet.write(row_num, col_saudi, row["Saudi"], number_format)
-            worksheet.write(row_num, col_non_saudi, row["Non-Saudi"], number_format)
+            worksheet.write_row(row_num, col_college, row, number_format)
         
         # Write totals row
         total_row = len(summary_df) + 2
         worksheet.write(total_row, col_college, "Total of Graduates", header_format)
-        worksheet.write(total_row, col_total, summary_df["Total Graduates"].sum(), number_format)
-        worksheet.write(total_row, col_ladies, summary_df["Ladies"].sum(), number_format)
-        worksheet.write(total_row, col_gentlemen, summary_df["Gentlemen"].sum(), number_format)
-        worksheet.write(total_row, col_saudi, summary_df["Saudi"].sum(), number_format)
-        worksheet.write(total_row, col_non_saudi, summary_df["Non-Saudi"].sum(), number_format)
+        totals = summary_df[["Total Graduates", "Ladies", "Gentlemen", "Saudi", "Non-Saudi"]].sum().tolist()
+        worksheet.write_row(total_row, col_total, totals, number_format)
         
         # Set column widths
         worksheet.set_column(col_college, col_college, 35)  # College names
         worksheet.set_column(col_total, col_non_saudi, 15)  # All numeric columns
         
-        print("Successfully created All years summary tab")
+        logger.debug("Successfully created All years summary tab")
         
     except Exception as e:
-        print(f"Error creating All years summary tab: {str(e)}")
+        logger.error("Error creating All years summary tab: %s", e)
 
 
 def process_alumni_list(session_id, colleges, years, allowed_statuses, gender_option, nationality_option=None, degree_option="all"):
@@ -1324,18 +1549,17 @@ def process_alumni_list(session_id, colleges, years, allowed_statuses, gender_op
         df = session_data[session_id]["data"]
         
         # Clean statuses
-        df["Current Status"] = df["Current Status"].apply(clean_status)
+        df["Current Status"] = clean_statuses(df["Current Status"])
         allowed_statuses = [clean_status(status) for status in allowed_statuses]
 
-        # Basic filters
-        filtered_df = df[df["College"].str.strip().isin(colleges)]
-        filtered_df = filtered_df[filtered_df["Year/Semester of Graduation"].str.strip().isin(years)]
+        # Basic filters (on the columns stripped at load)
+        filtered_df = df[df["_College"].isin(colleges) & df["_Year"].isin(years)]
 
         # Add degree filtering
         if degree_option == "bachelor":
-            filtered_df = filtered_df[~filtered_df["Student ID"].str.startswith("G", na=False)]
+            filtered_df = filtered_df[~filtered_df["_IsMaster"]]
         elif degree_option == "master":
-            filtered_df = filtered_df[filtered_df["Student ID"].str.startswith("G", na=False)]
+            filtered_df = filtered_df[filtered_df["_IsMaster"]]
 
         # Filter by gender if needed
         if gender_option.lower() != "all":
@@ -1348,16 +1572,16 @@ def process_alumni_list(session_id, colleges, years, allowed_statuses, gender_op
         # Filter by nationality
         if nationality_option and nationality_option.lower() != "all":
             if nationality_option.lower() == "saudi":
-                filtered_df = filtered_df[filtered_df["Nationality"].str.strip() == "Saudi Arabia"]
+                filtered_df = filtered_df[filtered_df["_IsSaudi"]]
             elif nationality_option.lower() == "non-saudi":
-                filtered_df = filtered_df[filtered_df["Nationality"].str.strip() != "Saudi Arabia"]
+                filtered_df = filtered_df[~filtered_df["_IsSaudi"]]
 
         filtered_df = filtered_df[filtered_df["Current Status"].isin(allowed_statuses)]
 
         if filtered_df.empty:
             return {"error": "No matching data found for the given filters."}
 
-        filtered_df["College Degree"] = filtered_df["College"].str.strip() + " " + \
+        filtered_df["College Degree"] = filtered_df["College"] + " " + \
                                        safe_get_column(filtered_df, "Degree").str.strip()
 
         # Generate a unique filename
@@ -1379,25 +1603,25 @@ def process_alumni_list(session_id, colleges, years, allowed_statuses, gender_op
         df_to_output = filtered_df[columns_to_output]
 
         with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
-            college_abbreviations = {
-                "College of Engineering & Advan": "CoE",
-                "College of Business": "CoB",
-                "College of Science & General S": "CoS",
-                "College of Medicine": "CoM",
-                "College of Pharmacy": "CoP"
-            }
+            header_format = writer.book.add_format({'bold': True, 'border': 1, 'align': 'center', 'valign': 'top'})
+            # Split the rows per college once and skip the colleges without any
+            college_frames = dict(list(df_to_output.groupby(filtered_df["_College"], observed=True, sort=False)))
             for college in colleges:
-                college_df = df_to_output[filtered_df["College"].str.strip() == college]
-                if college_df.empty:
+                if college not in college_frames:
                     continue
+                college_df = college_frames[college].fillna("")
                 sheet_name = college_abbreviations.get(college.strip(), college[:25])
-                college_df.to_excel(writer, sheet_name=sheet_name, index=False)
 
-                worksheet = writer.sheets[sheet_name]
+                # Stream rows straight to the sheet, with the same header style pandas uses
+                worksheet = writer.book.add_worksheet(sheet_name)
+                worksheet.write_row(0, 0, college_df.columns, header_format)
+                for row_num, row in enumerate(college_df.itertuples(index=False, name=None), start=1):
+                    worksheet.write_row(row_num, 0, row)
+
+                # Auto-fit column widths to the longest value or header
+                value_lengths = college_df.astype(str).apply(lambda column: column.str.len().max())
                 for i, col in enumerate(college_df.columns):
-                    series = college_df[col].fillna("")
-                    max_len = max(series.astype(str).apply(len).max(), len(col))
-                    worksheet.set_column(i, i, max_len + 2)
+                    worksheet.set_column(i, i, max(value_lengths[col], len(col)) + 2)
 
         return {
             "status": "success",
@@ -1414,31 +1638,19 @@ def process_workplace_report(session_id, colleges, years, degree_option, gender_
             return {"error": "No data found for your session. Please upload an Excel file first."}
 
         df = session_data[session_id]["data"]
-        stats = get_workplace_statistics(df, colleges, years, degree_option, gender_option, nationality_option)
+        stats = get_workplace_statistics(df, colleges, years, degree_option, gender_option, nationality_option,
+                                         session_data[session_id].get("columns"), as_series=True)
 
         # Generate a unique filename
         output_file = f"Workplace_Report_{uuid.uuid4().hex[:8]}.xlsx"
         file_path = os.path.join(app.config['GENERATED_FILES'], output_file)
 
-        with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
+        with open(file_path, "wb", buffering=output_buffer_size) as output, \
+                pd.ExcelWriter(output, engine="xlsxwriter") as writer:
             workbook = writer.book
 
             # Create formats
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#4472C4',
-                'font_color': 'white',
-                'border': 1,
-                'align': 'center'
-            })
-            cell_format = workbook.add_format({
-                'border': 1,
-                'align': 'left'
-            })
-            number_format = workbook.add_format({
-                'border': 1,
-                'align': 'center'
-            })
+            header_format, cell_format, number_format = create_report_formats(workbook)
 
             # Summary Sheet
             summary_df = pd.DataFrame({
@@ -1465,25 +1677,19 @@ def process_workplace_report(session_id, colleges, years, degree_option, gender_
             summary_sheet.set_column('B:B', 40)
 
             # Empty/Unknown Entries Analysis Sheet
-            empty_df = pd.DataFrame.from_dict(stats['empty_stats'], orient='index', columns=['Count'])
-            empty_df.index.name = 'Category'
-            empty_df.to_excel(writer, sheet_name='Empty Analysis')
+            stats['empty_stats'].rename_axis('Category').to_excel(writer, sheet_name='Empty Analysis', header=['Count'])
             empty_sheet = writer.sheets['Empty Analysis']
             empty_sheet.set_column('A:A', 40)
             empty_sheet.set_column('B:B', 15)
 
             # Top Employers Sheet
-            employers_df = pd.DataFrame.from_dict(stats['top_employers'], orient='index', columns=['Count'])
-            employers_df.index.name = 'Employer'
-            employers_df.to_excel(writer, sheet_name='Top Employers')
+            stats['top_employers'].rename_axis('Employer').to_excel(writer, sheet_name='Top Employers', header=['Count'])
             employer_sheet = writer.sheets['Top Employers']
             employer_sheet.set_column('A:A', 40)
             employer_sheet.set_column('B:B', 15)
 
             # Top Positions Sheet (replaced with High Positions)
-            high_positions_df = pd.DataFrame.from_dict(stats['high_positions'], orient='index', columns=['Count'])
-            high_positions_df.index.name = 'High Position'
-            high_positions_df.to_excel(writer, sheet_name='Top Positions')
+            stats['high_positions'].rename_axis('High Position').to_excel(writer, sheet_name='Top Positions', header=['Count'])
             position_sheet = writer.sheets['Top Positions']
             position_sheet.set_column('A:A', 40)
             position_sheet.set_column('B:B', 15)
@@ -1496,9 +1702,7 @@ def process_workplace_report(session_id, colleges, years, degree_option, gender_
             position_sheet.write(1, 4, f'{high_position_percentage:.2f}%')
 
             # Industry Distribution Sheet
-            industry_df = pd.DataFrame.from_dict(stats['industry_dist'], orient='index', columns=['Count'])
-            industry_df.index.name = 'Industry'
-            industry_df.to_excel(writer, sheet_name='Industry Distribution')
+            stats['industry_dist'].rename_axis('Industry').to_excel(writer, sheet_name='Industry Distribution', header=['Count'])
             industry_sheet = writer.sheets['Industry Distribution']
             industry_sheet.set_column('A:A', 40)
             industry_sheet.set_column('B:B', 15)
@@ -1538,12 +1742,9 @@ def process_banner_integration(banner_session_id, alumni_session_id):
         alumni_df["Student ID"] = alumni_df["Student ID"].astype(str).str.strip()
         
         # Find students in Banner who are not in the Alumni List
-        banner_student_ids = set(banner_df["Student ID"].tolist())
-        alumni_student_ids = set(alumni_df["Student ID"].tolist())
-        
-        new_student_ids = banner_student_ids - alumni_student_ids
+        new_mask = ~banner_df["Student ID"].isin(alumni_df["Student ID"])
         
-        if not new_student_ids:
+        if not new_mask.any():
             return {
                 "status": "success",
                 "message": "No new graduates found in Banner that are not already in the Alumni List.",
@@ -1554,117 +1755,76 @@ def process_banner_integration(banner_session_id, alumni_session_id):
             }
         
         # Get the new students from Banner
-        new_students_df = banner_df[banner_df["Student ID"].isin(new_student_ids)].copy()
-        
-        # Field mapping from Banner to Alumni List
-        field_mapping = {
-            "Graduation Term": "Year/Semester of Graduation",
-            "Student ID": "Student ID",
-            "Student Name": "Student Name",
-            "College": "College",
-            "Degree": "Degree",
-            "Major": "Major",
-            "Minor": "Minor",
-            "Concentration": "Concentration",
-            "Nationality": "Nationality",
-            "SSN": "SSN",
-            "Gender": "Gender",
-            "Alfaisal Email": "Alfaisal Email", 
-            "Personal Email": "Personal Email",
-            "Phone Number": "Phone Number",
-            "Joined AU": "Joining date",
-            "CGPA": "GPA"
-        }
-        
-        # Create a new dataframe with Alumni List structure
-        new_alumni_records = []
+        new_students_df = banner_df[new_mask]
         
         # Current date for comments
         current_date = datetime.now().strftime("%Y-%m-%d")
         
-        # Get the column order from the original alumni file
-        alumni_columns = alumni_df.columns.tolist()
-        
-        for _, row in new_students_df.iterrows():
-            new_record = {col: "" for col in alumni_columns}  # Initialize with empty values for all columns
-            
-            # Map fields from Banner to Alumni List
-            for banner_field, alumni_field in field_mapping.items():
-                if banner_field in row and alumni_field in alumni_columns:
-                    new_record[alumni_field] = row[banner_field]
-            
-            # Set default values for fields not in Banner
-            new_record["Current Status"] = "New graduate"
-            new_record["Current Workplace"] = ""
-            new_record["Current Position"] = ""
-            new_record["Work Industry"] = ""
-            new_record["Workplace Country"] = ""
-            new_record["Workplace City"] = ""
-            new_record["Work Email"] = ""
-            new_record["Work Phone"] = ""
-            new_record["Social Media and Events"] = ""
-            new_record["Comments"] = f"Added from Banner on {current_date}"
-            
-            new_alumni_records.append(new_record)
-        
-        # Convert to DataFrame with the same column order
-        new_alumni_df = pd.DataFrame(new_alumni_records, columns=alumni_columns)
+        # Get the column order from the original alumni file (without our internal "_" columns)
+        alumni_columns = [col for col in alumni_df.columns if not col.startswith("_")]
+        
+        # Map fields from Banner to Alumni List and set default values for fields not in Banner.
+        # Every other Alumni List column (workplace, position, work contacts, ...) starts empty
+        field_mapping = {banner_field: alumni_field for banner_field, alumni_field in banner_field_mapping.items()
+                         if banner_field in new_students_df.columns}
+        new_alumni_df = (
+            new_students_df[list(field_mapping)]
+            .rename(columns=field_mapping)
+            .assign(**{"Current Status": "New graduate", "Comments": f"Added from Banner on {current_date}"})
+            .reindex(columns=alumni_columns, fill_value="")
+        )
         
-        # Combine the original alumni data with new records
-        combined_df = pd.concat([alumni_df, new_alumni_df], ignore_index=True)
+        # The original alumni data followed by the new records. They are written one after the
+        # other below, so the two frames are never concatenated into a combined copy
+        combined_frames = [alumni_df[alumni_columns], new_alumni_df]
+        combined_records = len(alumni_df) + len(new_alumni_df)
         
         # Generate output filename based on the original
         base_name = os.path.splitext(alumni_file)[0]
         output_file = f"{base_name}_Updated_{uuid.uuid4().hex[:8]}.xlsx"
         file_path = os.path.join(app.config['GENERATED_FILES'], output_file)
         
-        # Copy the original Excel file to preserve formatting
-        original_file = os.path.join(app.config['UPLOAD_FOLDER'], alumni_file)
-        shutil.copy2(original_file, file_path)
-        
-        # Load the workbook to get the table name and style info
-        template_wb = load_workbook(file_path)
-        template_ws = template_wb.active
-        
-        # Get table info if it exists
-        table_name = None
-        table_style_info = None
-        if template_ws.tables:
-            table = list(template_ws.tables.values())[0]
-            table_name = list(template_ws.tables.keys())[0]
-            table_style_info = {
-                'name': table_name,
-                'style': table.tableStyleInfo
-            }
-        template_wb.close()
-        
-        # Write the combined data to the new file
-        with pd.ExcelWriter(file_path, engine='openpyxl', mode='w') as writer:
-            # Write the DataFrame
-            combined_df.to_excel(writer, index=False, sheet_name='Sheet1')
+        # Table name and style info, read when the file was uploaded. The new file is written
+        # from scratch, so there is no need to copy the original first
+        if "table_style_info" in session_data[alumni_session_id]:
+            table_style_info = session_data[alumni_session_id]["table_style_info"]
+        else:
+            original_file = os.path.join(app.config['UPLOAD_FOLDER'], alumni_file)
+            table_style_info = get_table_style_info(original_file)
+        
+        # Write the combined data to the new file, streaming the rows in write-only mode
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Sheet1')
+        # Same header style pandas' to_excel gives: bold, thin border, centred
+        header_font = Font(bold=True)
+        header_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
+        header_alignment = Alignment(horizontal='center', vertical='top')
+        header = []
+        for col in alumni_columns:
+            cell = WriteOnlyCell(ws, value=col)
+            cell.font = header_font
+            cell.border = header_border
+            cell.alignment = header_alignment
+            header.append(cell)
+        ws.append(header)
+        for frame in combined_frames:
+            for row in frame.itertuples(index=False, name=None):
+                ws.append(row)
+        
+        # If we had a table before, recreate it with the same style
+        if table_style_info:
+            tab = Table(displayName=table_style_info['name'],
+                      ref=f"A1:{get_column_letter(len(alumni_columns))}{combined_records + 1}")
+            # Write-only sheets can't read the headers back, so name the table columns here
+            tab.tableColumns = [TableColumn(id=i, name=str(name)) for i, name in enumerate(alumni_columns, start=1)]
             
-            # Access the workbook and worksheet
-            wb = writer.book
-            ws = wb['Sheet1']
+            # Set the table style if it was present in the original
+            if table_style_info['style']:
+                tab.tableStyleInfo = TableStyleInfo(**table_style_info['style'])
             
-            # If we had a table before, recreate it with the same style
-            if table_style_info:
-                from openpyxl.worksheet.table import Table, TableStyleInfo
-                tab = Table(displayName=table_style_info['name'],
-                          ref=f"A1:{get_column_letter(len(alumni_columns))}{len(combined_df) + 1}")
-                
-                # Set the table style if it was present in the original
-                if table_style_info['style']:
-                    style = table_style_info['style']
-                    tab.tableStyleInfo = TableStyleInfo(
-                        name=style.name,
-                        showFirstColumn=style.showFirstColumn,
-                        showLastColumn=style.showLastColumn,
-                        showRowStripes=style.showRowStripes,
-                        showColumnStripes=style.showColumnStripes
-                    )
-                
-                ws.add_table(tab)
+            ws.add_table(tab)
+        with open(file_path, "wb", buffering=output_buffer_size) as output:
+            wb.save(output)
         
         # Get list of new students with names for display
         new_students_info = new_students_df[["Student ID", "Student Name"]].values.tolist()
@@ -1672,10 +1832,10 @@ def process_banner_integration(banner_session_id, alumni_session_id):
         return {
             "status": "success",
             "file": output_file,
-            "new_records": len(new_alumni_records),
+            "new_records": len(new_alumni_df),
             "banner_records": len(banner_df),
             "alumni_records": len(alumni_df),
-            "combined_records": len(combined_df),
+            "combined_records": combined_records,
             "new_students": new_students_info
         }
             
@@ -1755,7 +1915,7 @@ def load_test_file():
         # Extract just the filename part (without the path)
         just_filename = os.path.basename(test_filename)
         uploaded_file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{session_id}_{just_filename}")
-        shutil.copy2(test_file_path, uploaded_file_path)
+        clone_file(test_file_path, uploaded_file_path)
         
         # Process the file using the same logic as the upload endpoint
         result = load_excel_data(uploaded_file_path, session_id)
@@ -1821,23 +1981,23 @@ def qaa_preview():
     # Apply nationality filter
     if nationality_option and nationality_option.lower() != "all":
         if nationality_option.lower() == "saudi":
-            filtered_df = filtered_df[filtered_df["Nationality"].str.strip() == "Saudi Arabia"]
+            filtered_df = filtered_df[filtered_df["_IsSaudi"]]
         elif nationality_option.lower() == "non-saudi":
-            filtered_df = filtered_df[filtered_df["Nationality"].str.strip() != "Saudi Arabia"]
+            filtered_df = filtered_df[~filtered_df["_IsSaudi"]]
     
     # Apply degree filter
     if degree_option == "bachelor":
-        filtered_df = filtered_df[~filtered_df["Student ID"].str.startswith("G", na=False)]
+        filtered_df = filtered_df[~filtered_df["_IsMaster"]]
     elif degree_option == "master":
-        filtered_df = filtered_df[filtered_df["Student ID"].str.startswith("G", na=False)]
+        filtered_df = filtered_df[filtered_df["_IsMaster"]]
     
     # Preview summary
-    college_counts = filtered_df["_College"].value_counts().to_dict()
+    college_counts = count_values(filtered_df["_College"]).to_dict()
     
     if mode_option == "simple":
         # For Simple mode, show gender breakdown instead of status
         if "_Gender" in filtered_df.columns:
-            gender_counts = filtered_df["_Gender"].value_counts().to_dict()
+            gender_counts = count_values(filtered_df["_Gender"]).to_dict()
         else:
             gender_counts = filtered_df["Gender"].value_counts().to_dict()
         return jsonify({
@@ -1848,7 +2008,7 @@ def qaa_preview():
         })
     else:
         # For Detailed mode, show status breakdown
-        status_counts = filtered_df["_CurrentStatus"].value_counts().head(10).to_dict()
+        status_counts = count_values(filtered_df["_CurrentStatus"]).head(10).to_dict()
         return jsonify({
             "total_records": len(filtered_df),
             "college_counts": college_counts,
@@ -1878,9 +2038,9 @@ def alumni_list_preview():
     
     # Apply degree filter
     if degree_option == "bachelor":
-        filtered_df = filtered_df[~filtered_df["Student ID"].str.startswith("G", na=False)]
+        filtered_df = filtered_df[~filtered_df["_IsMaster"]]
     elif degree_option == "master":
-        filtered_df = filtered_df[filtered_df["Student ID"].str.startswith("G", na=False)]
+        filtered_df = filtered_df[filtered_df["_IsMaster"]]
 
     # Filter by gender if needed
     if gender_option.lower() != "all":
@@ -1893,17 +2053,17 @@ def alumni_list_preview():
     # Filter by nationality
     if nationality_option and nationality_option.lower() != "all":
         if nationality_option.lower() == "saudi":
-            filtered_df = filtered_df[filtered_df["Nationality"].str.strip() == "Saudi Arabia"]
+            filtered_df = filtered_df[filtered_df["_IsSaudi"]]
         elif nationality_option.lower() == "non-saudi":
-            filtered_df = filtered_df[filtered_df["Nationality"].str.strip() != "Saudi Arabia"]
+            filtered_df = filtered_df[~filtered_df["_IsSaudi"]]
 
     # Filter by status
     filtered_df = filtered_df[filtered_df["_CurrentStatus"].isin(status_options)]
     
     # Preview summary
-    college_counts = filtered_df["_College"].value_counts().to_dict()
+    college_counts = count_values(filtered_df["_College"]).to_dict()
     if "_Gender" in filtered_df.columns:
-        gender_counts = filtered_df["_Gender"].value_counts().to_dict()
+        gender_counts = count_values(filtered_df["_Gender"]).to_dict()
     else:
         gender_counts = filtered_df["Gender"].value_counts().to_dict()
     
@@ -1930,7 +2090,8 @@ def workplace_preview():
     nationality_option = data.get('nationality_option', 'all')
     
     # Get workplace statistics
-    stats = get_workplace_statistics(df, colleges, years, degree_option, gender_option, nationality_option)
+    stats = get_workplace_statistics(df, colleges, years, degree_option, gender_option, nationality_option,
+                                     session_data[session_id].get("columns"))
     
     # Limit the size of the response for preview
     preview_stats = {
@@ -2130,31 +2291,24 @@ def generate_banner_integration():
 
 @app.route('/download/<filename>')
 def download_file(filename):
+    # With WEBALUMNI_X_SENDFILE set (USE_X_SENDFILE), the front-end server sends the file through an X-Sendfile header
     return send_from_directory(app.config['GENERATED_FILES'], filename, as_attachment=True)
 
 # Cleanup old files - could be run periodically in production
 @app.route('/cleanup', methods=['POST'])
 def cleanup_files():
     try:
-        # Get list of files in upload and generated folders
-        upload_files = os.listdir(app.config['UPLOAD_FOLDER'])
-        generated_files = os.listdir(app.config['GENERATED_FILES'])
-        
         # Get current time
         now = datetime.now()
-        
-        # Delete files older than 24 hours
-        for file in upload_files:
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], file)
-            file_created = datetime.fromtimestamp(os.path.getctime(file_path))
-            if (now - file_created).days > 0:  # Older than 1 day
-                os.remove(file_path)
-                
-        for file in generated_files:
-            file_path = os.path.join(app.config['GENERATED_FILES'], file)
-            file_created = datetime.fromtimestamp(os.path.getctime(file_path))
-            if (now - file_created).days > 0:  # Older than 1 day
-                os.remove(file_path)
+        cutoff = now.timestamp() - 24 * 60 * 60
+        
+        # Delete files older than 24 hours (scandir gives each entry's path without os.path.join,
+        # and is_file() usually needs no extra syscall; stat() still does one on POSIX)
+        for folder in (app.config['UPLOAD_FOLDER'], app.config['GENERATED_FILES']):
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.stat().st_ctime <= cutoff:  # Older than 1 day
+                        os.remove(entry.path)
                 
         # Clean up old sessions
         sessions_to_remove = []
@@ -4,8 +4,8 @@ Create test Excel file for 2014-2015 with exact known graduate counts
 Total: 251 graduates (162 male, 89 female)
 """
 
+import numpy as np
 import pandas as pd
-import random
 
 def create_test_data_2014_2015():
     """Create controlled test dataset for 2014-2015 validation"""
@@ -68,45 +68,36 @@ def create_test_data_2014_2015():
         "eMpLoYeD", "Business OWNER", "UnEmPlOyEd", "New Graduate", "Do Not CONTACT"
     ]
     
-    records = []
-    student_id_counter = 201400000  # Starting with 2014 year prefix
-    
-    for college, gender_counts in college_distribution.items():
-        for gender, count in gender_counts.items():
-            for i in range(count):
-                # Distribute across terms roughly evenly
-                term_index = i % len(graduation_terms)
-                graduation_term = graduation_terms[term_index]
-                
-                # 20% chance of being graduate student
-                is_graduate = random.random() < 0.2
-                
-                # Create student ID
-                if is_graduate:
-                    student_id = f"G{student_id_counter}"
-                else:
-                    student_id = str(student_id_counter)
-                
-                student_id_counter += 1
-                
-                # Generate record
-                record = {
-                    "Student ID": student_id,
-                    "Student Name": f"Test Student {student_id}",
-                    "College": college,
-                    "Year/Semester of Graduation": graduation_term,
-                    "Major": random.choice(majors_by_college[college]),
-                    "Gender": gender,
-                    "Current Status": random.choice(employment_statuses),
-                    "Current Workplace": f"Test Company {random.randint(1, 100)}",
-                    "Current Position": f"Test Position {random.randint(1, 50)}",
-                    "Nationality": "Saudi Arabia" if random.random() < 0.7 else "Non-Saudi"
-                }
-                
-                records.append(record)
-    
-    # Create DataFrame
-    df = pd.DataFrame(records)
+    # One entry per college/gender group, then every column is generated for all rows at once
+    rng = np.random.default_rng()
+    groups = [(college, gender, count)
+              for college, gender_counts in college_distribution.items()
+              for gender, count in gender_counts.items()]
+    group_sizes = [count for _, _, count in groups]
+    n = sum(group_sizes)
+    
+    # Distribute across terms roughly evenly (within each college/gender group)
+    term_index = np.concatenate([np.arange(count) % len(graduation_terms) for count in group_sizes])
+    
+    # 20% chance of being graduate student
+    is_graduate = rng.random(n) < 0.2
+    
+    # Create student IDs, starting with 2014 year prefix
+    student_ids = np.char.add(np.where(is_graduate, "G", ""), (201400000 + np.arange(n)).astype(str))
+    
+    # Generate records
+    df = pd.DataFrame({
+        "Student ID": student_ids,
+        "Student Name": np.char.add("Test Student ", student_ids),
+        "College": np.repeat([college for college, _, _ in groups], group_sizes),
+        "Year/Semester of Graduation": np.array(graduation_terms)[term_index],
+        "Major": np.concatenate([rng.choice(majors_by_college[college], size=count) for college, _, count in groups]),
+        "Gender": np.repeat([gender for _, gender, _ in groups], group_sizes),
+        "Current Status": rng.choice(employment_statuses, size=n),
+        "Current Workplace": np.char.add("Test Company ", rng.integers(1, 101, size=n).astype(str)),
+        "Current Position": np.char.add("Test Position ", rng.integers(1, 51, size=n).astype(str)),
+        "Nationality": np.where(rng.random(n) < 0.7, "Saudi Arabia", "Non-Saudi")
+    })
     
     # Verify final counts
     print(f"\nActual generated data:")
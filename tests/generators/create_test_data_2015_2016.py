@@ -5,11 +5,25 @@ Total: 285 graduates (180 male, 105 female)
 Status distribution: 200 Employed, 57 Unemployed, 28 Studying
 """
 
+import hashlib
+import os
+
+import numpy as np
 import pandas as pd
-import random
+import xlsxwriter
+
+# Fixed seed, so the generated file is the same on every run
+default_seed = 20152016
+
+# Part of the data hash, bump it when the way the file is written changes so that
+# files written by an older version are replaced
+file_format_version = "xlsxwriter-2"
 
-def create_test_data_2015_2016():
-    """Create controlled test dataset for 2015-2016 validation"""
+def create_test_data_2015_2016(seed=default_seed):
+    """Create controlled test dataset for 2015-2016 validation (seed=None for a random file)"""
+    
+    # Single random generator for every draw below
+    rng = np.random.default_rng(seed)
     
     # Define exact distribution to match expected results
     college_distribution = {
@@ -74,62 +88,45 @@ def create_test_data_2015_2016():
     unemployed_statuses = ["Unemployed", "Unemployed ", " Unemployed", "unemployed", "UNEMPLOYED", "UnEmPlOyEd"]
     studying_statuses = ["Studying", "Studying ", " Studying", "studying", "STUDYING", "StUdYiNg"]
     
-    # Create status distribution list
-    status_distribution = []
-    # Add 200 employed statuses
-    for i in range(200):
-        status_distribution.append(random.choice(employed_statuses_with_variations))
-    # Add 57 unemployed statuses  
-    for i in range(57):
-        status_distribution.append(random.choice(unemployed_statuses))
-    # Add 28 studying statuses
-    for i in range(28):
-        status_distribution.append(random.choice(studying_statuses))
+    # Create status distribution: 200 employed, 57 unemployed and 28 studying statuses,
+    # filled into one preallocated array (object dtype, like the DataFrame column it becomes)
+    status_distribution = np.empty(total_graduates, dtype=object)
+    status_distribution[:200] = rng.choice(employed_statuses_with_variations, size=200)
+    status_distribution[200:257] = rng.choice(unemployed_statuses, size=57)
+    status_distribution[257:] = rng.choice(studying_statuses, size=28)
     
     # Shuffle the distribution to randomize assignment
-    random.shuffle(status_distribution)
-    
-    records = []
-    student_id_counter = 201500000  # Starting with 2015 year prefix
-    status_index = 0
-    
-    for college, gender_counts in college_distribution.items():
-        for gender, count in gender_counts.items():
-            for i in range(count):
-                # Distribute across terms roughly evenly
-                term_index = i % len(graduation_terms)
-                graduation_term = graduation_terms[term_index]
-                
-                # 20% chance of being graduate student
-                is_graduate = random.random() < 0.2
-                
-                # Create student ID
-                if is_graduate:
-                    student_id = f"G{student_id_counter}"
-                else:
-                    student_id = str(student_id_counter)
-                
-                student_id_counter += 1
-                
-                # Generate record with controlled status distribution
-                record = {
-                    "Student ID": student_id,
-                    "Student Name": f"Test Student {student_id}",
-                    "College": college,
-                    "Year/Semester of Graduation": graduation_term,
-                    "Major": random.choice(majors_by_college[college]),
-                    "Gender": gender,
-                    "Current Status": status_distribution[status_index],
-                    "Current Workplace": f"Test Company {random.randint(1, 100)}",
-                    "Current Position": f"Test Position {random.randint(1, 50)}",
-                    "Nationality": "Saudi Arabia" if random.random() < 0.7 else "Non-Saudi"
-                }
-                
-                records.append(record)
-                status_index += 1
-    
-    # Create DataFrame
-    df = pd.DataFrame(records)
+    rng.shuffle(status_distribution)
+    
+    # One entry per college/gender group, then every column is generated for all rows at once
+    groups = [(college, gender, count)
+              for college, gender_counts in college_distribution.items()
+              for gender, count in gender_counts.items()]
+    group_sizes = [count for _, _, count in groups]
+    n = sum(group_sizes)
+    
+    # Distribute across terms roughly evenly (within each college/gender group)
+    term_index = np.concatenate([np.arange(count) % len(graduation_terms) for count in group_sizes])
+    
+    # 20% chance of being graduate student
+    is_graduate = rng.random(n) < 0.2
+    
+    # Create student IDs, starting with 2015 year prefix
+    student_ids = np.char.add(np.where(is_graduate, "G", ""), (201500000 + np.arange(n)).astype(str))
+    
+    # Generate records with controlled status distribution
+    df = pd.DataFrame({
+        "Student ID": student_ids,
+        "Student Name": np.char.add("Test Student ", student_ids),
+        "College": np.repeat([college for college, _, _ in groups], group_sizes),
+        "Year/Semester of Graduation": np.array(graduation_terms)[term_index],
+        "Major": np.concatenate([rng.choice(majors_by_college[college], size=count) for college, _, count in groups]),
+        "Gender": np.repeat([gender for _, gender, _ in groups], group_sizes),
+        "Current Status": status_distribution,
+        "Current Workplace": np.char.add("Test Company ", rng.integers(1, 101, size=n).astype(str)),
+        "Current Position": np.char.add("Test Position ", rng.integers(1, 51, size=n).astype(str)),
+        "Nationality": np.where(rng.random(n) < 0.7, "Saudi Arabia", "Non-Saudi")
+    })
     
     # Verify final counts
     print(f"\nActual generated data:")
@@ -144,19 +141,20 @@ def create_test_data_2015_2016():
     
     # Verify gender distribution by college
     print(f"\nGender distribution by college:")
-    for college in college_distribution.keys():
-        college_df = df[df["College"] == college]
-        college_gender_counts = college_df["Gender"].value_counts()
-        male_count = college_gender_counts.get("Male", 0)
-        female_count = college_gender_counts.get("Female", 0)
+    college_gender_counts = (
+        df.groupby(["College", "Gender"]).size()
+        .unstack(fill_value=0)
+        .reindex(index=list(college_distribution), columns=["Male", "Female"], fill_value=0)
+    )
+    for college, male_count, female_count in college_gender_counts.itertuples(name=None):
         print(f"{college}: {male_count}M + {female_count}F = {male_count + female_count}")
     
     # Verify status distribution (for testing purposes)
     print(f"\nStatus distribution verification:")
-    status_counts = df["Current Status"].value_counts()
-    employed_count = sum(status_counts.get(status, 0) for status in employed_statuses_with_variations)
-    unemployed_count = sum(status_counts.get(status, 0) for status in unemployed_statuses)
-    studying_count = sum(status_counts.get(status, 0) for status in studying_statuses)
+    current_status = df["Current Status"]
+    employed_count = int(current_status.isin(employed_statuses_with_variations).sum())
+    unemployed_count = int(current_status.isin(unemployed_statuses).sum())
+    studying_count = int(current_status.isin(studying_statuses).sum())
     print(f"Employed variations: {employed_count}")
     print(f"Unemployed variations: {unemployed_count}")
     print(f"Studying variations: {studying_count}")
@@ -166,7 +164,32 @@ def create_test_data_2015_2016():
     
     # Save to Excel file
     output_file = "/home/rakanlinux/coolProjects/WebAlumni/tests/data/test_data_2015_2016.xlsx"
-    df_sorted.to_excel(output_file, index=False, sheet_name="Alumni_Data")
+    
+    # Skip the Excel write if the existing file was written from the same data by the same
+    # writer (the hash is kept next to it, xlsx files themselves differ by their timestamps)
+    hash_file = f"{output_file}.sha256"
+    data_hash = hashlib.sha256(file_format_version.encode())
+    data_hash.update(pd.util.hash_pandas_object(df_sorted, index=False).to_numpy().tobytes())
+    data_hash = data_hash.hexdigest()
+    if os.path.exists(output_file) and os.path.exists(hash_file):
+        with open(hash_file) as f:
+            if f.read().strip() == data_hash:
+                print(f"\nTest file is up to date: {output_file}")
+                return output_file
+    
+    # xlsxwriter in constant_memory mode streams each row to disk instead of building the workbook
+    # in memory. It drops writes to rows it has already flushed, so rows are written whole (pandas'
+    # to_excel writes column by column, which would leave only the first column)
+    workbook = xlsxwriter.Workbook(output_file, {"constant_memory": True})
+    worksheet = workbook.add_worksheet("Alumni_Data")
+    # Same header style as pandas' to_excel
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    worksheet.write_row(0, 0, df_sorted.columns, header_format)
+    for row_index, row in enumerate(df_sorted.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_index, 0, row)
+    workbook.close()
+    with open(hash_file, "w") as f:
+        f.write(data_hash)
     
     print(f"\nCreated test file: {output_file}")
     print(f"This file should produce exactly:")
@@ -5,11 +5,75 @@ Total: 320 graduates (200 male, 120 female)
 Status distribution: 224 Employed, 64 Unemployed, 32 Studying
 """
 
+import hashlib
+import os
+
+import numpy as np
 import pandas as pd
-import random
+import xlsxwriter
+
+# Fixed seed, so the generated file is the same on every run
+default_seed = 20162017
+
+# Print the planned and generated counts only when FIXTURE_DEBUG is set
+debug_output = bool(os.environ.get("FIXTURE_DEBUG"))
+
+# Part of the data hash, bump it when the way the file is written changes so that
+# files written by an older version are replaced
+file_format_version = "xlsxwriter-2"
+
+# Employment statuses with specific distribution for testing
+# Need to create exactly: 224 Employed, 64 Unemployed, 32 Studying
+
+# Employment status mapping for detailed mode testing
+employed_statuses = (
+    "Employed", "Employed - Add to List", "Business Owner", "Training", 
+    "New graduate", "Others", "Do Not Contact", "Left The Country", "Passed Away"
+)
+
+# Add variations for data quality testing
+employed_statuses_with_variations = employed_statuses + (
+    # Whitespace variations
+    "Employed ", " Employed", "  Employed  ", "Business Owner ", " Business Owner",
+    "New graduate ", " New graduate", "Training ", " Training",
+    # Case variations
+    "employed", "EMPLOYED", "business owner", "BUSINESS OWNER", "new graduate", "NEW GRADUATE",
+    "training", "TRAINING", "others", "OTHERS", "do not contact", "DO NOT CONTACT",
+    # Mixed case variations
+    "eMpLoYeD", "Business OWNER", "New Graduate", "Do Not CONTACT"
+)
 
-def create_test_data_2016_2017():
-    """Create controlled test dataset for 2016-2017 validation"""
+unemployed_statuses = ("Unemployed", "Unemployed ", " Unemployed", "unemployed", "UNEMPLOYED", "UnEmPlOyEd")
+studying_statuses = ("Studying", "Studying ", " Studying", "studying", "STUDYING", "StUdYiNg")
+
+# Sets for the status verification lookups
+employed_status_set = frozenset(employed_statuses_with_variations)
+unemployed_status_set = frozenset(unemployed_statuses)
+studying_status_set = frozenset(studying_statuses)
+
+def write_with_xlsxwriter(df, output_file):
+    """Write the test data sheet with xlsxwriter"""
+    # Rows are written straight to xlsxwriter (values only, no per-cell pandas styling), and
+    # constant_memory mode streams each row to disk instead of building the workbook in memory
+    workbook = xlsxwriter.Workbook(output_file, {"constant_memory": True})
+    worksheet = workbook.add_worksheet("Alumni_Data")
+    # Same header style as pandas' to_excel
+    header_format = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+    worksheet.write_row(0, 0, df.columns, header_format)
+    for row_index, row in enumerate(df.itertuples(index=False, name=None), start=1):
+        worksheet.write_row(row_index, 0, row)
+    workbook.close()
+
+def create_test_data_2016_2017(seed=default_seed, output_format="xlsx"):
+    """
+    Create controlled test dataset for 2016-2017 validation (seed=None for a random file).
+    output_format="parquet" or "pickle" writes a Parquet or pickle file instead, for tests that
+    don't need to read Excel (the app's /run_tests loads the xlsx file)
+    """
+    if output_format not in ("xlsx", "parquet", "pickle"):
+        raise ValueError(f"Unsupported output format: {output_format}")
+    
+    rng = np.random.default_rng(seed)
     
     # Define exact distribution to match expected results
     college_distribution = {
@@ -25,10 +89,11 @@ def create_test_data_2016_2017():
     total_female = sum(college["Female"] for college in college_distribution.values()) 
     total_graduates = total_male + total_female
     
-    print(f"Planned distribution:")
-    print(f"Total Male: {total_male}")
-    print(f"Total Female: {total_female}")
-    print(f"Total Graduates: {total_graduates}")
+    if debug_output:
+        print(f"Planned distribution:")
+        print(f"Total Male: {total_male}")
+        print(f"Total Female: {total_female}")
+        print(f"Total Graduates: {total_graduates}")
     
     assert total_male == 200, f"Male count should be 200, got {total_male}"
     assert total_female == 120, f"Female count should be 120, got {total_female}"
@@ -50,123 +115,133 @@ def create_test_data_2016_2017():
         "College of Pharmacy": ["Clinical Pharmacy", "Pharmaceutical Sciences"]
     }
     
-    # Employment statuses with specific distribution for testing
-    # Need to create exactly: 224 Employed, 64 Unemployed, 32 Studying
+    # Create status distribution: 224 employed, 64 unemployed and 32 studying statuses
+    status_distribution = np.concatenate([
+        rng.choice(employed_statuses_with_variations, size=224),
+        rng.choice(unemployed_statuses, size=64),
+        rng.choice(studying_statuses, size=32)
+    ])
     
-    # Employment status mapping for detailed mode testing
-    employed_statuses = [
-        "Employed", "Employed - Add to List", "Business Owner", "Training", 
-        "New graduate", "Others", "Do Not Contact", "Left The Country", "Passed Away"
-    ]
+    # Shuffle the distribution to randomize assignment
+    rng.shuffle(status_distribution)
     
-    # Add variations for data quality testing
-    employed_statuses_with_variations = employed_statuses + [
-        # Whitespace variations
-        "Employed ", " Employed", "  Employed  ", "Business Owner ", " Business Owner",
-        "New graduate ", " New graduate", "Training ", " Training",
-        # Case variations
-        "employed", "EMPLOYED", "business owner", "BUSINESS OWNER", "new graduate", "NEW GRADUATE",
-        "training", "TRAINING", "others", "OTHERS", "do not contact", "DO NOT CONTACT",
-        # Mixed case variations
-        "eMpLoYeD", "Business OWNER", "New Graduate", "Do Not CONTACT"
-    ]
+    # Per-row random draws, made for all rows up front
+    is_graduate = rng.random(total_graduates) < 0.2  # 20% chance of being graduate student
+    workplaces = np.char.add("Test Company ", rng.integers(1, 101, size=total_graduates).astype(str))
+    positions = np.char.add("Test Position ", rng.integers(1, 51, size=total_graduates).astype(str))
+    nationalities = np.where(rng.random(total_graduates) < 0.7, "Saudi Arabia", "Non-Saudi")
     
-    unemployed_statuses = ["Unemployed", "Unemployed ", " Unemployed", "unemployed", "UNEMPLOYED", "UnEmPlOyEd"]
-    studying_statuses = ["Studying", "Studying ", " Studying", "studying", "STUDYING", "StUdYiNg"]
-    
-    # Create status distribution list
-    status_distribution = []
-    # Add 224 employed statuses
-    for i in range(224):
-        status_distribution.append(random.choice(employed_statuses_with_variations))
-    # Add 64 unemployed statuses  
-    for i in range(64):
-        status_distribution.append(random.choice(unemployed_statuses))
-    # Add 32 studying statuses
-    for i in range(32):
-        status_distribution.append(random.choice(studying_statuses))
+    # Create student IDs (one per row, starting with 2016 year prefix) and names
+    student_ids = np.char.add(np.where(is_graduate, "G", ""), (201600000 + np.arange(total_graduates)).astype(str))
+    student_names = np.char.add("Test Student ", student_ids)
     
-    # Shuffle the distribution to randomize assignment
-    random.shuffle(status_distribution)
-    
-    records = []
-    student_id_counter = 201600000  # Starting with 2016 year prefix
-    status_index = 0
-    
-    for college, gender_counts in college_distribution.items():
-        for gender, count in gender_counts.items():
-            for i in range(count):
-                # Distribute across terms roughly evenly
-                term_index = i % len(graduation_terms)
-                graduation_term = graduation_terms[term_index]
-                
-                # 20% chance of being graduate student
-                is_graduate = random.random() < 0.2
-                
-                # Create student ID
-                if is_graduate:
-                    student_id = f"G{student_id_counter}"
-                else:
-                    student_id = str(student_id_counter)
-                
-                student_id_counter += 1
-                
-                # Generate record with controlled status distribution
-                record = {
-                    "Student ID": student_id,
-                    "Student Name": f"Test Student {student_id}",
-                    "College": college,
-                    "Year/Semester of Graduation": graduation_term,
-                    "Major": random.choice(majors_by_college[college]),
-                    "Gender": gender,
-                    "Current Status": status_distribution[status_index],
-                    "Current Workplace": f"Test Company {random.randint(1, 100)}",
-                    "Current Position": f"Test Position {random.randint(1, 50)}",
-                    "Nationality": "Saudi Arabia" if random.random() < 0.7 else "Non-Saudi"
-                }
-                
-                records.append(record)
-                status_index += 1
-    
-    # Create DataFrame
-    df = pd.DataFrame(records)
-    
-    # Verify final counts
-    print(f"\nActual generated data:")
-    gender_counts = df["Gender"].value_counts()
-    print(f"Male: {gender_counts.get('Male', 0)}")
-    print(f"Female: {gender_counts.get('Female', 0)}")
-    print(f"Total: {len(df)}")
-    
-    college_counts = df["College"].value_counts()
-    for college in college_distribution.keys():
-        print(f"{college}: {college_counts.get(college, 0)}")
-    
-    # Verify gender distribution by college
-    print(f"\nGender distribution by college:")
-    for college in college_distribution.keys():
-        college_df = df[df["College"] == college]
-        college_gender_counts = college_df["Gender"].value_counts()
-        male_count = college_gender_counts.get("Male", 0)
-        female_count = college_gender_counts.get("Female", 0)
-        print(f"{college}: {male_count}M + {female_count}F = {male_count + female_count}")
-    
-    # Verify status distribution (for testing purposes)
-    print(f"\nStatus distribution verification:")
-    status_counts = df["Current Status"].value_counts()
-    employed_count = sum(status_counts.get(status, 0) for status in employed_statuses_with_variations)
-    unemployed_count = sum(status_counts.get(status, 0) for status in unemployed_statuses)
-    studying_count = sum(status_counts.get(status, 0) for status in studying_statuses)
-    print(f"Employed variations: {employed_count}")
-    print(f"Unemployed variations: {unemployed_count}")
-    print(f"Studying variations: {studying_count}")
-    
-    # Sort by graduation term and college for consistency
-    df_sorted = df.sort_values(['Year/Semester of Graduation', 'College', 'Gender'])
+    # Majors are drawn once per college/gender group
+    group_majors = {
+        (college, gender): rng.choice(majors_by_college[college], size=count)
+        for college, gender_counts in college_distribution.items()
+        for gender, count in gender_counts.items()
+    }
+    
+    # One entry per college/gender group, then every column is built for all rows at once
+    groups = [(college, gender, college_distribution[college][gender])
+              for college in sorted(college_distribution)
+              for gender in sorted(college_distribution[college])]
+    group_sizes = [count for _, _, count in groups]
+    group_index = np.repeat(np.arange(len(groups)), group_sizes)
+    
+    # Distribute across terms roughly evenly: every third student of the group
+    term_index = np.concatenate([np.arange(count) % len(graduation_terms) for count in group_sizes])
+    
+    # Rows are put in order by graduation term, college and gender (graduation_terms and groups
+    # are sorted, and lexsort is stable), so the DataFrame needs no sort before it is written
+    row_order = np.lexsort((group_index, term_index))
+    group_index = group_index[row_order]
+    
+    colleges = np.array([college for college, _, _ in groups])[group_index]
+    terms = np.array(graduation_terms)[term_index[row_order]]
+    majors = np.concatenate([group_majors[college, gender] for college, gender, _ in groups])[row_order]
+    genders = np.array([gender for _, gender, _ in groups])[group_index]
+    
+    # Create DataFrame from the columns (College, Gender, Current Status and Nationality
+    # only have a few distinct values, so they are stored as categoricals)
+    df = pd.DataFrame({
+        "Student ID": student_ids,
+        "Student Name": student_names,
+        "College": pd.Categorical(colleges),
+        "Year/Semester of Graduation": terms,
+        "Major": majors,
+        "Gender": pd.Categorical(genders),
+        "Current Status": pd.Categorical(status_distribution),
+        "Current Workplace": workplaces,
+        "Current Position": positions,
+        "Nationality": pd.Categorical(nationalities)
+    })
+    
+    # The verification counts are only computed and printed when FIXTURE_DEBUG is set
+    if debug_output:
+        # Final counts, all taken from one college/gender breakdown of the frame
+        college_gender_counts = (
+            df.groupby(["College", "Gender"], observed=True).size()
+            .unstack(fill_value=0)
+            .reindex(index=list(college_distribution), columns=["Male", "Female"], fill_value=0)
+        )
+        
+        print(f"\nActual generated data:")
+        gender_counts = college_gender_counts.sum()
+        print(f"Male: {gender_counts['Male']}")
+        print(f"Female: {gender_counts['Female']}")
+        print(f"Total: {len(df)}")
+        
+        for college, college_count in college_gender_counts.sum(axis=1).items():
+            print(f"{college}: {college_count}")
+        
+        # Verify gender distribution by college
+        print(f"\nGender distribution by college:")
+        for college, male_count, female_count in college_gender_counts.itertuples(name=None):
+            print(f"{college}: {male_count}M + {female_count}F = {male_count + female_count}")
+        
+        # Verify status distribution (for testing purposes)
+        print(f"\nStatus distribution verification:")
+        current_status = df["Current Status"]
+        employed_count = int(current_status.isin(employed_status_set).sum())
+        unemployed_count = int(current_status.isin(unemployed_status_set).sum())
+        studying_count = int(current_status.isin(studying_status_set).sum())
+        print(f"Employed variations: {employed_count}")
+        print(f"Unemployed variations: {unemployed_count}")
+        print(f"Studying variations: {studying_count}")
     
     # Save to Excel file
     output_file = "/home/rakanlinux/coolProjects/WebAlumni/tests/data/test_data_2016_2017.xlsx"
-    df_sorted.to_excel(output_file, index=False, sheet_name="Alumni_Data")
+    
+    if output_format == "parquet":
+        # Needs pyarrow (or fastparquet), which the app itself doesn't use
+        output_file = output_file.replace(".xlsx", ".parquet")
+        df.to_parquet(output_file, index=False, compression="zstd")
+        print(f"\nCreated test file: {output_file}")
+        return output_file
+    
+    if output_format == "pickle":
+        # Keeps the categorical dtypes, and needs nothing beyond pandas to read back
+        output_file = output_file.replace(".xlsx", ".pkl")
+        df.to_pickle(output_file)
+        print(f"\nCreated test file: {output_file}")
+        return output_file
+    
+    # Skip the Excel write if the existing file was written from the same data by the same
+    # writer (the hash is kept next to it, xlsx files themselves differ by their timestamps)
+    hash_file = f"{output_file}.sha256"
+    data_hash = hashlib.sha256(file_format_version.encode())
+    data_hash.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    data_hash = data_hash.hexdigest()
+    if os.path.exists(output_file) and os.path.exists(hash_file):
+        with open(hash_file) as f:
+            if f.read().strip() == data_hash:
+                print(f"\nTest file is up to date: {output_file}")
+                return output_file
+    
+    write_with_xlsxwriter(df, output_file)
+    with open(hash_file, "w") as f:
+        f.write(data_hash)
     
     print(f"\nCreated test file: {output_file}")
     print(f"This file should produce exactly:")